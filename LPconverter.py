@@ -0,0 +1,20 @@
+""" Converter between the text format and the binary format of LP files """
+
+import argparse
+from lib import *
+
+def convert_file(input_file, output_file, binary):
+    """ Reads 'input_file' (in any format) and writes it to 'output_file' in the binary or in the text format """
+    lp = LinearProgram(input_file)
+    lp.save(output_file, binary)
+
+# ================== MAIN ======================================================
+if __name__ == '__main__':
+
+    argparser = argparse.ArgumentParser(description='Converts a LP file from the text format to the binary format, or back')
+    argparser.add_argument('input', help="name of the LP file to convert, in the text or in the binary format")
+    argparser.add_argument('output', help="name of the output file")
+    argparser.add_argument('-text', action="store_true", help="write the output in the text format. Default is the binary format")
+    options=argparser.parse_args()
+
+    convert_file(options.input, options.output, not options.text)
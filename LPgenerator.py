@@ -2,6 +2,8 @@
 
 import argparse
 from random import randint
+import numpy as np
+from lib.lpFile import write_binary_header
 
 def generate_random(output_file, nbVar, nbConst, twophase, hollow):
     thefile = open(output_file, 'w')
@@ -66,6 +68,84 @@ def generate_klee_minty(output_file,d):
 
         thefile.close()
 
+def matrix_chunks(seeds, nbVar, nbConst, mini, density, chunkSize):
+    """
+    Yields (first row, block of rows) of the constraint matrix. Each entry is uniform in [mini, 100],
+    and is kept with probability 'density'. The values and the mask have their own random streams,
+    so the matrix only depends on the seeds, not on the chunk size.
+    """
+    values = np.random.default_rng(seeds[0])
+    mask = np.random.default_rng(seeds[1])
+    for start in range(0, nbConst, chunkSize):
+        rows = values.integers(mini, 101, (min(chunkSize, nbConst-start), nbVar))
+        if density < 1:
+            rows[mask.random(rows.shape) >= density] = 0
+        yield start, rows
+
+def generate_feasible(output_file, nbVar, nbConst, density=1.0, twophase=False, seed=None, chunkSize=None, binary=False):
+    """
+    Random LP built around a known optimal solution, feasible and bounded by construction.
+    A primal solution x >= 0 and a dual solution y >= 0 are drawn first, then
+    b = A*x + s and c = transpose(A)*y - r, where the slacks s are 0 on the rows where y > 0
+    and the reduced costs r are 0 on the columns where x > 0. x and y are feasible, and optimal by
+    complementary slackness. All the coefficients are integers.
+    The rows are written by chunks of 'chunkSize' rows : c is needed before the rows, so the matrix is
+    generated twice from the same seed, and is never held in memory.
+    Returns the optimal value.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(3)
+    if chunkSize is None:
+        chunkSize = max(1, 2**20//max(nbVar, 1)) # about a million coefficients per chunk
+    mini = -100 if twophase else 0
+    rng = np.random.default_rng(seeds[2])
+    x = np.where(rng.random(nbVar) < 0.5, rng.integers(1, 11, nbVar), 0)
+    y = np.where(rng.random(nbConst) < 0.5, rng.integers(1, 11, nbConst), 0)
+    slacks = np.where(y==0, rng.integers(1, 101, nbConst), 0)
+    reducedCosts = np.where(x==0, rng.integers(1, 101, nbVar), 0)
+
+    b = np.zeros(nbConst, dtype=np.int64)
+    c = -reducedCosts
+    for start,rows in matrix_chunks(seeds, nbVar, nbConst, mini, density, chunkSize):
+        b[start:start+len(rows)] = rows @ x
+        c += y[start:start+len(rows)] @ rows
+    b += slacks
+
+    if binary:
+        with open(output_file, 'wb') as thefile:
+            write_binary_header(thefile, nbVar, nbConst, 1)
+            thefile.write(c.astype("<i8").tobytes())
+            thefile.write(b.astype("<i8").tobytes())
+            for start,rows in matrix_chunks(seeds, nbVar, nbConst, mini, density, chunkSize):
+                thefile.write(rows.astype("<i8").tobytes())
+    else:
+        with open(output_file, 'w') as thefile:
+            thefile.write("{0}\n{1}\n".format(nbVar, nbConst))
+            thefile.write(" ".join(map(str, c.tolist()))+"\n")
+            thefile.write(" ".join(map(str, b.tolist()))+"\n")
+            for start,rows in matrix_chunks(seeds, nbVar, nbConst, mini, density, chunkSize):
+                np.savetxt(thefile, rows, fmt="%d")
+    return int(c @ x)
+
+def generate_block_diagonal(output_file, nbBlocks, blockSize, seed=None):
+    """
+    LP made of 'nbBlocks' independent LPs of 'blockSize' variables and constraints : its matrix is block diagonal.
+    The coefficients of the blocks, of b and of c are positive, so the LP is feasible and bounded.
+    The pivots of a block never fill the other blocks in : the tableau stays as sparse as the matrix
+    """
+    rng = np.random.default_rng(seed)
+    n = nbBlocks*blockSize
+    with open(output_file, 'w') as thefile:
+        thefile.write("{0}\n{0}\n".format(n))
+        thefile.write(" ".join(map(str, rng.integers(1, 101, n).tolist()))+"\n")
+        thefile.write(" ".join(map(str, rng.integers(1, 101, n).tolist()))+"\n")
+        row = np.zeros(n, dtype=np.int64)
+        for k in range(nbBlocks):
+            block = rng.integers(1, 101, (blockSize, blockSize))
+            for line in block:
+                row[k*blockSize:(k+1)*blockSize] = line
+                thefile.write(" ".join(map(str, row.tolist()))+"\n")
+            row[k*blockSize:(k+1)*blockSize] = 0
+
 # ================== MAIN ======================================================
 if __name__ == '__main__':
 
@@ -77,10 +157,21 @@ if __name__ == '__main__':
     argparser.add_argument('-twophase', action="store_true", help="Random generation parameter. Allow the generator to output a LP that need 2 phases")
     argparser.add_argument('-hollow', action="store_true", help="Random generation parameter. Create a matrix with a lot of 0s")
     argparser.add_argument('-klee-minty', help="Generate the Klee Minty cube of dimension d")
+    argparser.add_argument('-blocks', type=int, help="generate an LP whose matrix is made of this number of independent n x n blocks (n given by -n)")
+    argparser.add_argument('-feasible', action="store_true", help="generate a random LP which is feasible and bounded, around a known optimal solution. Much faster on big instances")
+    argparser.add_argument('-density', type=float, help="Feasible generation parameter. Probability for a coefficient of the matrix to be kept. Default is 1", default=1.0)
+    argparser.add_argument('-seed', type=int, help="Feasible generation parameter. Seed of the generator : the same seed gives the same LP")
+    argparser.add_argument('-chunk', type=int, help="Feasible generation parameter. Number of rows generated and written at once")
+    argparser.add_argument('-binary', action="store_true", help="Feasible generation parameter. Write the LP in the binary format")
     options=argparser.parse_args()
 
     filename = options.filename
     if options.random:
         generate_random(filename, int(options.n), int(options.m), options.twophase, options.hollow)
+    elif options.feasible:
+        value = generate_feasible(filename, int(options.n), int(options.m), options.density, options.twophase, options.seed, options.chunk, options.binary)
+        print("The optimal value of this LP is {0}".format(value))
+    elif options.blocks is not None:
+        generate_block_diagonal(filename, options.blocks, int(options.n), options.seed)
     elif options.klee_minty is not None:
         generate_klee_minty(filename,int(options.klee_minty))
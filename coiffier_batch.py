@@ -0,0 +1,189 @@
+""" Batch solver : solves a whole set of LP files in parallel """
+
+import argparse
+import glob
+import json
+import os
+import signal
+import sys
+from time import *
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from lib import *
+import coiffier_simplex as simplex
+
+class Timeout(Exception):
+    pass
+
+# ================== Workers ===================================================
+
+def configure_worker(options):
+    """ Sets the options of the simplex module in a worker process """
+    for name,value in options.items():
+        setattr(simplex, name, value)
+
+def raise_timeout(signum, frame):
+    raise Timeout
+
+def empty_record(filename):
+    return {"file": filename, "status": None, "objective": None, "solution": None, "pivots": None, "timings": None}
+
+def error_record(filename, error):
+    """ The record of a file whose worker failed : it crashed, or its result could not be sent back """
+    record = empty_record(filename)
+    record["status"] = "Error"
+    record["error"] = error
+    return record
+
+def solve_file(filename, timeout, profile=False):
+    """
+    Parses and solves one LP file.
+    Returns a result record : a dict with the status, the objective value,
+    the solution, the number of pivots and the wall time
+    (and the time spent in each operation if 'profile' is True)
+    """
+    record = empty_record(filename)
+    start_time = time()
+    alarm = timeout is not None and hasattr(signal, "SIGALRM") # no alarms on Windows
+    if alarm:
+        signal.signal(signal.SIGALRM, raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    if profile:
+        simplex.profiler = Profiler()
+    try:
+        lp = LinearProgram(filename, sparse=(simplex.engine=="Sparse"), exact=(simplex.backend=="Exact"))
+        result = simplex.simplex_solve(lp)
+        record["status"] = result.status
+        if result.is_optimal():
+            record["objective"] = frac_print(result.objective)
+            record["solution"] = [frac_print(x) for x in result.solution]
+        record["pivots"] = result.nbPivot
+        record["interiorPointIterations"] = result.nbIterations
+        record["degeneratePivots"] = result.nbDegenerate
+        record["stalled"] = result.stalled
+        if "solution cache" in result.settings:
+            record["cache"] = result.settings["solution cache"]
+        record["timings"] = result.timings
+        if profile:
+            record["profile"] = simplex.profiler.to_dict()
+    except Timeout:
+        record["status"] = "Timeout"
+    except Exception as e:
+        record["status"] = "Error"
+        record["error"] = repr(e)
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    record["time"] = time()-start_time
+    return record
+
+# ================== Batch =====================================================
+
+def list_files(paths):
+    """ The LP files given by a list of directories, files or glob patterns """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(glob.glob(os.path.join(path, "*.in")))
+        else:
+            files += sorted(glob.glob(path))
+    return files
+
+def write_record(output, record):
+    output.write(json.dumps(record)+"\n")
+    output.flush()
+
+def run_pool(files, output, workers, timeout, options, profile):
+    """
+    Solves 'files' in one pool of 'workers' processes, and writes their records.
+    If a worker crashes (or is killed), the pool is broken and every pending file fails with it :
+    returns these files, in their order in 'files', and the number of files solved
+    """
+    crashed = set()
+    solved = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=configure_worker, initargs=(options,)) as pool:
+        futures = {pool.submit(solve_file, f, timeout, profile): f for f in files}
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except BrokenProcessPool:
+                crashed.add(futures[future])
+                continue
+            except Exception as e:
+                record = error_record(futures[future], repr(e))
+            write_record(output, record)
+            solved += 1
+    return [f for f in files if f in crashed], solved
+
+def solve_batch(files, output, workers=None, timeout=None, options=None, profile=False):
+    """
+    Solves every file of 'files' in a pool of 'workers' processes.
+    One JSON record per LP is written to 'output' as soon as it is solved.
+    'options' are the options of the simplex module (rule, engine, backend...).
+    When a worker crashes, the files lost with the pool are solved again in a new pool.
+    If no file was solved before the crash, the culprit is one of the first 'workers' files (the only ones running) :
+    they are solved alone, each in its own pool, and the one crashing again gets an Error record.
+    """
+    options = options if options is not None else dict()
+    workers = workers or os.cpu_count() or 1
+    pending = list(files)
+    while pending:
+        pending, solved = run_pool(pending, output, workers, timeout, options, profile)
+        if pending and solved==0:
+            for f in pending[:workers]:
+                crashed, solved = run_pool([f], output, 1, timeout, options, profile)
+                if crashed:
+                    write_record(output, error_record(f, "the worker process crashed"))
+            pending = pending[workers:]
+
+# ================== MAIN ======================================================
+if __name__ == '__main__':
+
+    argparser = argparse.ArgumentParser(description='Batch mode of the simplex solver : solves every LP of a directory or a glob pattern in parallel')
+    argparser.add_argument('paths', nargs='+', help="directories (all their .in files are solved), files or glob patterns")
+    argparser.add_argument('-o', help="output file, one JSON record per LP. Default is the standard output")
+    argparser.add_argument('-workers', type=int, help="number of worker processes. Default is the number of CPUs")
+    argparser.add_argument('-timeout', type=float, help="time limit for each LP, in seconds. No limit by default")
+    argparser.add_argument('-rule', help="specify the pivot's rule. Default is Bland", default="Bland")
+    argparser.add_argument('-ratio', help="specify the ratio test. Default is Standard", default="Standard")
+    argparser.add_argument('-engine', help="specify the solver engine. Default is Tableau", default="Tableau")
+    argparser.add_argument('-backend', help="specify the numeric backend. Default is Exact", default="Exact")
+    argparser.add_argument('-pivot-tol', type=float, help="Float backend only. Smallest absolute value accepted as a pivot", default=1e-9)
+    argparser.add_argument('-feas-tol', type=float, help="Float backend only. Tolerance used for feasibility and optimality tests", default=1e-9)
+    argparser.add_argument('-dual', action="store_true", help="use the dual simplex when the slack basis is dual feasible")
+    argparser.add_argument('-presolve', action="store_true", help="reduce the LPs before building their tableaux")
+    argparser.add_argument('-profile', action="store_true", help="record the time spent in each operation of the simplex")
+    argparser.add_argument('-scaling', help="scaling method of the LPs : Geometric or Equilibration. No scaling by default")
+    argparser.add_argument('-max-iter', type=int, help="stop each LP after this number of pivots. No limit by default")
+    argparser.add_argument('-time-limit', type=float, help="stop the simplex of each LP after this time, in seconds, and report its status. No limit by default")
+    argparser.add_argument('-stalling-limit', type=int, help="number of consecutive degenerate pivots after which an anti-cycling rule is used. Default is 50", default=50)
+    argparser.add_argument('-no-crossover', action="store_true", help="InteriorPoint engine only. Give the interior solutions without running the simplex from them")
+    argparser.add_argument('-cache', help="directory of a solution cache shared by the workers. LPs already solved are not solved again")
+    argparser.add_argument('-cache-size', type=float, help="largest size of the solution cache, in megabytes. Default is 100", default=100)
+    options=argparser.parse_args()
+
+    if options.rule not in simplex.pivotRules:
+        raise Exception("The rule '{0}' does not refer to any implemented rule. Possible rules are {1}".format(options.rule, ", ".join(simplex.pivotRules)))
+    if options.ratio not in simplex.ratioTests:
+        raise Exception("The ratio test '{0}' does not refer to any implemented ratio test. Possible ratio tests are {1}".format(options.ratio, ", ".join(simplex.ratioTests)))
+    if options.engine not in simplex.engineNames:
+        raise Exception("The engine '{0}' does not refer to any implemented engine. Possible engines are {1}".format(options.engine, ", ".join(simplex.engineNames)))
+    if options.backend not in numericBackends:
+        raise Exception("The backend '{0}' does not refer to any implemented backend. Possible backends are {1}".format(options.backend, ", ".join(numericBackends)))
+    if options.engine=="Integer" and options.backend!="Exact":
+        raise Exception("The Integer engine can only be used with the Exact backend")
+    if options.scaling is not None and options.scaling not in scalingMethods:
+        raise Exception("The scaling '{0}' does not refer to any implemented scaling method. Possible methods are {1}".format(options.scaling, ", ".join(scalingMethods)))
+
+    simplexOptions = {"rule": options.rule, "ratioTest": options.ratio, "engine": options.engine,
+                      "backend": options.backend, "pivotTolerance": options.pivot_tol,
+                      "feasibilityTolerance": options.feas_tol, "dualMode": options.dual,
+                      "presolveMode": options.presolve, "scaling": options.scaling,
+                      "maxIterations": options.max_iter, "timeLimit": options.time_limit,
+                      "stallingLimit": options.stalling_limit, "crossover": not options.no_crossover,
+                      "solutionCache": SolutionCache(options.cache, int(options.cache_size*2**20)) if options.cache else None}
+    files = list_files(options.paths)
+    output = open(options.o, 'w') if options.o else sys.stdout
+    solve_batch(files, output, options.workers, options.timeout, simplexOptions, options.profile)
+    if options.o:
+        output.close()
@@ -0,0 +1,239 @@
+""" Benchmark suite : compares the pivot rules on the inputs folder and on generated families of LPs """
+
+import argparse
+import csv
+import glob
+import json
+import os
+import random
+import signal
+import sys
+import tempfile
+import tracemalloc
+from time import *
+from lib import *
+import coiffier_simplex as simplex
+import LPgenerator
+from coiffier_batch import Timeout, raise_timeout
+
+FIELDS = ["instance", "family", "size", "engine", "backend", "rule", "seed", "status", "objective", "pivots", "time", "timePerPivot", "peakMemory", "error"]
+
+# ================== Instances =================================================
+
+def generate_instances(directory, sizes, kleeMintySizes, seeds):
+    """
+    Writes the generated families into 'directory'.
+    Returns a list of (instance name, family, size, seed, filename).
+    The random families are generated once per seed, the Klee-Minty cubes once.
+    The block diagonal family has n blocks of size 5 : its tableau stays sparse, unlike the hollow random LPs
+    """
+    instances = []
+    for seed in seeds:
+        for n in sizes:
+            for family,twophase,hollow in [("random",False,False), ("random-twophase",True,False), ("random-hollow",False,True)]:
+                name = "{0}_{1}_seed{2}".format(family, n, seed)
+                filename = os.path.join(directory, name+".in")
+                random.seed(seed)
+                LPgenerator.generate_random(filename, n, n, twophase, hollow)
+                instances.append((name, family, n, seed, filename))
+            name = "block-diagonal_{0}_seed{1}".format(n, seed)
+            filename = os.path.join(directory, name+".in")
+            LPgenerator.generate_block_diagonal(filename, n, 5, seed)
+            instances.append((name, "block-diagonal", n, seed, filename))
+    for d in kleeMintySizes:
+        name = "klee_minty_{0}".format(d)
+        filename = os.path.join(directory, name+".in")
+        LPgenerator.generate_klee_minty(filename, d)
+        instances.append((name, "klee-minty", d, None, filename))
+    return instances
+
+def input_instances(paths):
+    """ The LP files of the inputs folder (or any other files), as instances of the family 'inputs' """
+    files = []
+    for path in paths:
+        files += sorted(glob.glob(os.path.join(path, "*.in"))) if os.path.isdir(path) else sorted(glob.glob(path))
+    return [(os.path.basename(f), "inputs", None, None, f) for f in files]
+
+# ================== Runs ======================================================
+
+def run(filename, rule, seed, timeout, memory):
+    """
+    Solves 'filename' with 'rule'. Returns the fields of one record.
+    The peak memory is measured in a second run, since tracemalloc slows the solver down.
+    Any exception is caught and kept in the "error" field : one broken instance does not stop the benchmark.
+    The status is "Error" if the solve itself failed, the status of the solve otherwise
+    """
+    simplex.rule = rule
+    record = {"status": None, "objective": None, "pivots": None, "time": None, "timePerPivot": None, "peakMemory": None, "error": None}
+    alarm = timeout is not None and hasattr(signal, "SIGALRM")
+    if alarm:
+        signal.signal(signal.SIGALRM, raise_timeout)
+    try:
+        random.seed(seed) # for the Random rule
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        lp = LinearProgram(filename, sparse=(simplex.engine=="Sparse"), exact=(simplex.backend=="Exact"))
+        start_time = perf_counter()
+        result = simplex.simplex_solve(lp)
+        record["time"] = perf_counter()-start_time
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        record["status"] = result.status
+        record["pivots"] = result.nbPivot
+        record["timePerPivot"] = record["time"]/result.nbPivot if result.nbPivot else None
+        if result.is_optimal():
+            record["objective"] = frac_print(result.objective)
+        if memory:
+            random.seed(seed)
+            if alarm: # the second run is slower : it gets twice the time limit
+                signal.setitimer(signal.ITIMER_REAL, 2*timeout)
+            lp = LinearProgram(filename, sparse=(simplex.engine=="Sparse"), exact=(simplex.backend=="Exact"))
+            tracemalloc.start()
+            simplex.simplex_solve(lp)
+            record["peakMemory"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    except Timeout:
+        if record["status"] is None:
+            record["status"] = "Timeout"
+    except Exception as e:
+        record["error"] = repr(e)
+        if record["status"] is None:
+            record["status"] = "Error"
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    return record
+
+def run_benchmark(instances, rules, seeds, timeout=None, memory=True, verbose=False):
+    """
+    Runs every rule on every instance. The files of the inputs folder are solved once per seed,
+    the generated instances once (their seed is part of the instance).
+    Returns the list of records.
+    """
+    records = []
+    for name, family, size, instanceSeed, filename in instances:
+        for rule in sorted(rules):
+            for seed in ([instanceSeed] if instanceSeed is not None else seeds):
+                record = {"instance": name, "family": family, "size": size, "engine": simplex.engine,
+                          "backend": simplex.backend, "rule": rule, "seed": seed}
+                record.update(run(filename, rule, seed, timeout, memory))
+                if verbose:
+                    print("{0:30} {1:10} seed {2:<4} {3:10} pivots {4!s:>8}  time {5}".format(name, rule, seed, record["status"],
+                          record["pivots"], "-" if record["time"] is None else "{0:.4f}".format(record["time"])))
+                records.append(record)
+    return records
+
+# ================== Reports ===================================================
+
+def write_report(records, filename):
+    """ Writes the records in JSON, or in CSV if the file name ends with .csv """
+    with open(filename, 'w', newline='') as f:
+        if filename.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+        else:
+            json.dump(records, f, indent=1)
+
+def read_report(filename):
+    with open(filename, 'r', newline='') as f:
+        if not filename.endswith(".csv"):
+            return json.load(f)
+        records = list(csv.DictReader(f))
+    for r in records: # csv only gives strings
+        for field in ["pivots", "time", "timePerPivot", "peakMemory"]:
+            r[field] = None if r[field]=="" else float(r[field])
+        if r.get("error")=="":
+            r["error"] = None
+        r["seed"] = None if r["seed"]=="" else int(r["seed"])
+        r["size"] = None if r["size"]=="" else int(r["size"])
+    return records
+
+def summary(records):
+    """ Total number of pivots and total time of each rule, on the runs that did not time out or fail """
+    rules = dict()
+    for r in records:
+        s = rules.setdefault(r["rule"], {"runs": 0, "timeouts": 0, "errors": 0, "pivots": 0, "time": 0})
+        s["runs"] += 1
+        if r["status"]=="Timeout":
+            s["timeouts"] += 1
+        elif r["status"]=="Error":
+            s["errors"] += 1
+        else:
+            s["pivots"] += r["pivots"]
+            s["time"] += r["time"]
+    lines = ["{0:10} {1:>6} {2:>9} {3:>7} {4:>10} {5:>10} {6:>14}".format("rule", "runs", "timeouts", "errors", "pivots", "time (s)", "time/pivot (ms)")]
+    for rule,s in sorted(rules.items()):
+        perPivot = 1000*s["time"]/s["pivots"] if s["pivots"] else 0
+        lines.append("{0:10} {1:>6} {2:>9} {3:>7} {4:>10} {5:>10.3f} {6:>14.4f}".format(rule, s["runs"], s["timeouts"], s["errors"],
+                     int(s["pivots"]), s["time"], perPivot))
+    return "\n".join(lines)
+
+def compare(records, baseline, tolerance, minTime=0.01):
+    """
+    Compares the records with those of a baseline report, run by run (same instance, engine, backend, rule and seed).
+    A run regresses if its status or its number of pivots changed,
+    or if it is more than 'tolerance' (relative) and more than 'minTime' seconds slower,
+    so that the noise on very short runs is ignored. Returns the list of the regressions
+    """
+    key = lambda r: (r["instance"], r.get("engine"), r.get("backend"), r["rule"], r["seed"])
+    reference = {key(r): r for r in baseline}
+    regressions = []
+    for r in records:
+        old = reference.get(key(r))
+        if old is None:
+            continue
+        if r["status"]!=old["status"] or r["pivots"]!=old["pivots"]:
+            regressions.append("{0} {1} seed {2} : {3} with {4} pivots instead of {5} with {6} pivots".format(
+                r["instance"], r["rule"], r["seed"], r["status"], r["pivots"], old["status"], old["pivots"]))
+        elif r["time"] is not None and old["time"] and r["time"] > old["time"]*(1+tolerance) and r["time"]-old["time"] > minTime:
+            regressions.append("{0} {1} seed {2} : {3:.4f}s instead of {4:.4f}s (x{5:.2f})".format(
+                r["instance"], r["rule"], r["seed"], r["time"], old["time"], r["time"]/old["time"]))
+    return regressions
+
+# ================== MAIN ======================================================
+if __name__ == '__main__':
+
+    argparser = argparse.ArgumentParser(description='Benchmark of the pivot rules on the inputs folder and on generated LPs')
+    argparser.add_argument('-o', help="report file, in JSON (or in CSV if its name ends with .csv)", default="benchmark.json")
+    argparser.add_argument('-inputs', nargs='*', help="directories or files of LPs to benchmark. Default is the inputs folder", default=["inputs"])
+    argparser.add_argument('-sizes', nargs='*', type=int, help="sizes n (n variables and n constraints) of the random LPs", default=[10, 20, 40])
+    argparser.add_argument('-klee-minty', nargs='*', type=int, help="dimensions of the Klee-Minty cubes", default=[4, 6, 8, 10])
+    argparser.add_argument('-seeds', nargs='*', type=int, help="seeds of the random generator and of the Random rule", default=[0, 1, 2])
+    argparser.add_argument('-rules', nargs='*', help="pivot rules to compare. Default is every rule", default=sorted(simplex.pivotRules))
+    argparser.add_argument('-timeout', type=float, help="time limit of each run, in seconds", default=60)
+    argparser.add_argument('-no-memory', action="store_true", help="do not measure the peak memory (it needs a second run of each LP)")
+    argparser.add_argument('-baseline', help="report of a previous benchmark to compare with")
+    argparser.add_argument('-tolerance', type=float, help="relative slowdown above which a run is reported as a regression. Default is 0.25", default=0.25)
+    argparser.add_argument('-min-time', type=float, help="smallest slowdown, in seconds, reported as a regression. Default is 0.01", default=0.01)
+    argparser.add_argument('-engine', help="specify the solver engine. Default is Tableau", default="Tableau")
+    argparser.add_argument('-backend', help="specify the numeric backend. Default is Exact", default="Exact")
+    argparser.add_argument('-v', action="store_true", help="print each run")
+    options=argparser.parse_args()
+
+    for rule in options.rules:
+        if rule not in simplex.pivotRules:
+            raise Exception("The rule '{0}' does not refer to any implemented rule. Possible rules are {1}".format(rule, ", ".join(simplex.pivotRules)))
+    if options.engine not in simplex.engineNames:
+        raise Exception("The engine '{0}' does not refer to any implemented engine. Possible engines are {1}".format(options.engine, ", ".join(simplex.engineNames)))
+    if options.backend not in numericBackends:
+        raise Exception("The backend '{0}' does not refer to any implemented backend. Possible backends are {1}".format(options.backend, ", ".join(numericBackends)))
+    simplex.engine = options.engine
+    simplex.backend = options.backend
+
+    with tempfile.TemporaryDirectory() as directory:
+        instances = input_instances(options.inputs)
+        instances += generate_instances(directory, options.sizes, options.klee_minty, options.seeds)
+        records = run_benchmark(instances, options.rules, options.seeds, options.timeout, not options.no_memory, options.v)
+    write_report(records, options.o)
+    print(summary(records))
+
+    if options.baseline:
+        regressions = compare(records, read_report(options.baseline), options.tolerance, options.min_time)
+        if regressions:
+            print("\n{0} regressions compared to {1} :".format(len(regressions), options.baseline))
+            print("\n".join(regressions))
+            sys.exit(1)
+        print("\nNo regression compared to {0}".format(options.baseline))
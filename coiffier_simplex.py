@@ -6,6 +6,7 @@
 ################################################################################
 
 import argparse
+from fractions import Fraction
 from time import *
 from random import randint
 from lib import *
@@ -14,8 +15,32 @@ import numpy as np
 verboseMode = False
 debugMode = False
 rule = "Random"
+ratioTest = "Standard"
+engine = "Tableau"
+backend = "Exact"
+pivotTolerance = 1e-9 # only used by the Float backend
+feasibilityTolerance = 1e-9 # only used by the Float backend
+dualMode = False # solve with the dual simplex when the slack basis is dual feasible
+presolveMode = False # reduce the LP before building its tableau
+scaling = None # scaling method of the LP, None for no scaling
+profiler = None # Profiler timing each operation of the simplex, None to disable it
+iterationCallbacks = [] # functions called after each pivot, see notify_iteration
+maxIterations = None # the resolution stops after this number of pivots, None for no limit
+timeLimit = None # the resolution stops after this time in seconds, None for no limit
+stallingLimit = 50 # consecutive degenerate pivots after which the simplex switches to an anti-cycling rule
+cyclingWindow = 100 # number of recent bases remembered to detect cycling
+pricingWindow = 50 # number of columns scanned at once by partial pricing
+candidateListSize = 5 # number of candidates kept by multiple pricing
+solutionCache = None # SolutionCache giving back the results of LPs already solved, None to disable it
+crossover = True # the InteriorPoint engine hands its solution to the simplex, which finishes at an optimal vertex
+crossoverEngine = "Tableau" # tableau engine of the simplex run by the crossover
+interiorPointTolerance = 1e-8 # relative residuals and duality gap at which the interior point method stops
+interiorPointMaxIterations = 100
 
-pivotRules = {"Random", "Bland", "MaxCoeff", "Custom"}
+pivotRules = {"Random", "Bland", "MaxCoeff", "Custom", "Devex", "Partial", "Multiple"}
+ratioTests = {"Standard", "Harris", "Lexicographic", "Bland"}
+solverEngines = {"Tableau": Tableau, "Revised": RevisedTableau, "Sparse": SparseTableau, "Integer": IntegerTableau}
+engineNames = set(solverEngines) | {"InteriorPoint"}
 
 # ========== Exception Definitions =============================================
 
@@ -25,124 +50,662 @@ class Unbounded(Exception):
 class Infeasible(Exception):
     pass
 
+class LimitReached(Exception):
+    """ The iteration or time limit is reached. Its argument is the status of the result """
+    pass
+
 # =============== Simplex algorithm functions ==================================
 
-def simplex_choose_entering(tab):
-    """ depends on the pivot rule """
+def make_backend():
+    """ Builds the numeric backend selected by the options """
+    if backend=="Float":
+        return FloatBackend(pivotTolerance, feasibilityTolerance)
+    return numericBackends[backend]()
+
+def simplex_choose_entering(tab, pivotRule=None):
+    """ depends on the pivot rule (the global rule by default) """
+    if pivotRule is None:
+        pivotRule = rule
     n = -1
-    if rule=="Random":
-        non_neg = [x for x in tab.get_non_basic() if tab[0,(x-1)]>0]
-        if non_neg :
+    eps = tab.backend.feasibilityTolerance
+    if pivotRule in ("Custom", "Devex"): # these rules weigh the reduced costs : they need their values
+        costs = tab.get_reduced_costs()
+    elif pivotRule not in ("Partial", "Multiple"): # these rules only price some of the columns
+        costs = tab.get_scaled_reduced_costs()
+    if pivotRule=="Random":
+        nonBasic = tab.get_non_basic()
+        non_neg = nonBasic[costs[nonBasic-1]>eps]
+        if len(non_neg):
             n = non_neg[randint(0,len(non_neg)-1)]
-    elif rule=="Bland":
-        for x in tab.get_non_basic():
-            if tab[0,(x-1)]>0:
-                n=x
-                break;
-    elif rule=="MaxCoeff":
-        n = np.argmax(tab[0,0:-1])+1
-        if tab[0,n-1]<=0:
-            n=-1
-    elif rule=="Custom":
-        t = tab[0,0:-1].copy()
-        for i in range(len(t)):
-            if np.dot(tab[:,i], tab[:,i])!=0:
-                t[i] /= np.dot(tab[:,i], tab[:,i])
-            else:
-                t[i]=-1
-        n = np.argmax(t)+1
-        if tab[0,n-1]<=0:
-            n=-1
+    elif pivotRule=="Bland":
+        nonBasic = tab.get_non_basic()
+        improving = nonBasic[costs[nonBasic-1]>eps]
+        if len(improving):
+            n = improving[0]
+    elif pivotRule=="MaxCoeff":
+        if len(costs):
+            n = np.argmax(costs)+1
+            if costs[n-1]<=eps:
+                n=-1
+    elif pivotRule=="Custom":
+        # steepest edge : the column norms are kept up to date by the tableau
+        norms = tab.get_column_norms()
+        candidates = np.flatnonzero(costs>eps) # the norm of an improving column is at least its cost squared
+        if len(candidates):
+            t = costs[candidates]/norms[candidates]
+            n = candidates[np.argmax(t)]+1
+    elif pivotRule=="Devex":
+        # approximate steepest edge, with reference weights instead of exact norms
+        weights = tab.get_devex_weights()
+        candidates = np.flatnonzero(costs>eps)
+        if len(candidates):
+            t = costs[candidates].astype(float)**2/weights[candidates]
+            n = candidates[np.argmax(t)]+1
+    elif pivotRule=="Partial":
+        n = partial_pricing(tab, eps)
+    elif pivotRule=="Multiple":
+        n = multiple_pricing(tab, eps)
     else:
         raise Exception("Pivot rule is not valid !")
     if verboseMode and n!=-1:
         print("The entering variable is x_{0}".format(n))
     return n
 
-def simplex_choose_leaving(tab, enteringVar):
-    n = -1
-    m = float("inf")
-    for j in range(1,tab.height):
-        if tab[j,enteringVar-1]>0:
-            maxval = tab[j,-1]/tab[j,enteringVar-1]
-            if 0<=maxval<m:
-                m=maxval
-                n=j
-    if n==-1: # no upper bound
+def partial_pricing(tab, eps):
+    """
+    Dantzig's rule on a window of pricingWindow columns. The windows rotate over the columns :
+    the next search starts after the window of the last entering variable,
+    and the following windows are only priced if this one has no improving column
+    """
+    nbCol = tab.width-1
+    if nbCol==0:
+        return -1
+    start = tab.pricingOffset % nbCol
+    for k in range(0, nbCol, pricingWindow):
+        cols = (start + np.arange(k, min(k+pricingWindow, nbCol))) % nbCol
+        costs = tab.get_scaled_reduced_costs_of(cols)
+        best = np.argmax(costs)
+        if costs[best]>eps:
+            tab.pricingOffset = cols[-1]+1
+            return cols[best]+1
+    return -1
+
+def multiple_pricing(tab, eps):
+    """
+    A full pricing keeps the candidateListSize columns of largest reduced costs.
+    The next pivots only price these candidates, and choose the largest reduced cost among those
+    that are still improving. A full pricing is done again once no candidate is left
+    """
+    candidates = tab.pricingCandidates
+    if candidates is not None and len(candidates):
+        costs = tab.get_scaled_reduced_costs_of(candidates)
+        improving = costs>eps
+        candidates, costs = candidates[improving], costs[improving]
+    if candidates is None or len(candidates)==0:
+        costs = tab.get_scaled_reduced_costs()
+        candidates = np.flatnonzero(costs>eps)
+        candidates = candidates[np.argsort(-costs[candidates], kind="stable")[:candidateListSize]]
+        costs = costs[candidates]
+    tab.pricingCandidates = candidates
+    if len(candidates)==0:
+        return -1
+    return candidates[np.argmax(costs)]+1
+
+def lexicographic_min(tab, rows, col):
+    """
+    Among the candidate rows, the one whose vector (rhs, slack columns)/pivot
+    is lexicographically the smallest. These vectors are pairwise distinct, so there are no ties left.
+    The simplex can not cycle as long as every row of (rhs, slack columns) stays lexicographically positive,
+    which holds when the test is used from the start, on the slack basis
+    """
+    pivots = col[rows]
+    values = tab.ratios(tab.get_scaled_rhs()[rows], pivots)
+    slack = tab.nbVar
+    while True:
+        ties = values==values.min()
+        rows, pivots = rows[ties], pivots[ties]
+        slack += 1
+        if len(rows)==1 or slack > tab.nbVar+tab.height-1:
+            return rows[0]
+        # the slack columns are computed one at a time, only while ties are left (a single ftran for the Revised engine)
+        values = tab.ratios(tab.get_scaled_column(slack)[rows], pivots)
+
+def simplex_choose_leaving(tab, enteringVar, test=None):
+    """ ratio test, depends on ratioTest (or on 'test' if given) """
+    if test is None:
+        test = ratioTest
+    col = tab.get_scaled_column(enteringVar)
+    rhs = tab.get_scaled_rhs()
+    if tab.backend.dtype!=object:
+        rhs = np.maximum(rhs, 0) # rounding errors
+    rows = np.flatnonzero(col[1:]>tab.backend.pivotTolerance)+1
+    if len(rows)==0: # no upper bound
         raise Unbounded
-    var = tab.varAssocToConstraint[n] # find the basic variable associated with row n
-    assert(tab.constraintAssocToVar[var]==n) # just to make sure
+    ratios = tab.ratios(rhs[rows], col[rows])
+    if test=="Standard":
+        n = rows[np.argmin(ratios)]
+    elif test=="Harris":
+        # pass 1 : largest step keeping every basic variable above -tolerance
+        thetaMax = tab.ratios(rhs[rows]+tab.backend.feasibilityTolerance, col[rows]).min()
+        # pass 2 : among the rows allowing this step, the largest pivot
+        candidates = rows[ratios<=thetaMax]
+        n = candidates[np.argmax(np.abs(col[candidates]))]
+    elif test=="Lexicographic":
+        n = lexicographic_min(tab, rows[ratios==ratios.min()], col)
+    elif test=="Bland":
+        # among the rows of minimal ratio, the one of smallest basic variable
+        candidates = rows[ratios==ratios.min()]
+        n = candidates[np.argmin(tab.basisHead[candidates])]
+    else:
+        raise Exception("Ratio test is not valid !")
+    var = tab.basisHead[n] # find the basic variable associated with row n
+    assert(tab.basisPosition[var]==n) # just to make sure
     if verboseMode:
         print("The leaving variable is x_{0} \n".format(var))
     return var
 
-def simplex_one_phase(tab):
+def simplex_choose_leaving_dual(tab, bland=False):
+    """
+    dual simplex : the basic variable of the row with the most negative right hand side, -1 if there is none.
+    With 'bland', the basic variable of smallest index among those that are negative (no cycling)
+    """
+    rhs = tab.get_scaled_rhs()
+    negative = np.flatnonzero(rhs[1:] < -tab.backend.feasibilityTolerance)+1
+    if len(negative)==0:
+        return -1
+    if bland:
+        var = tab.basisHead[negative].min()
+    else:
+        var = tab.basisHead[negative[np.argmin(rhs[negative])]]
+    if verboseMode:
+        print("The leaving variable is x_{0}".format(var))
+    return var
+
+def simplex_choose_entering_dual(tab, leavingVar):
+    """
+    dual ratio test on the row of leavingVar : among its negative entries,
+    the one keeping every reduced cost nonpositive
+    """
+    row = tab.get_scaled_row(tab.basisPosition[leavingVar])
+    cols = tab.get_non_basic()-1
+    cols = cols[row[cols] < -tab.backend.pivotTolerance]
+    if len(cols)==0: # the row can not become nonnegative
+        raise Infeasible
+    ratios = tab.ratios(tab.get_scaled_reduced_costs()[cols], row[cols])
+    var = cols[np.argmin(ratios)]+1
+    if verboseMode:
+        print("The entering variable is x_{0} \n".format(var))
+    return var
+
+def notify_iteration(tab, phase, inVar, outVar, pivot):
+    """
+    Calls each function of iterationCallbacks with a dict describing the pivot just done :
+    the phase, the iteration number, the new objective value, the entering and leaving variables
+    and the pivot element
+    """
+    info = {"phase": phase, "iteration": tab.nbPivot, "objective": tab.get_value_of_solution(),
+            "entering": inVar, "leaving": outVar, "pivot": pivot}
+    for callback in iterationCallbacks:
+        callback(info)
+
+def anti_cycling(event):
+    if verboseMode:
+        print("The simplex is {0} : it switches to Bland's rule\n".format(event))
+
+def simplex_one_phase(tab, phase="phase2", monitor=None):
+    """
+    Primal simplex, until no variable can improve the solution.
+    'monitor' is the PivotMonitor of the resolution. When it detects stalling or cycling,
+    Bland's rule chooses both the entering and the leaving variables of the remaining pivots,
+    which terminates from any basis.
+    Raises LimitReached when the iteration or time limit is reached
+    """
+    if monitor is None:
+        monitor = PivotMonitor(stallingLimit, cyclingWindow, maxIterations, timeLimit)
+    monitor.start_phase(tab)
+    pivotRule, test = (rule, ratioTest) if not monitor.stalled else ("Bland", "Bland")
+    timed = profiler is not None
     while True:
         if debugMode:
             print("Basic variables : " + str(tab.get_basic()))
             print("Non basic variables : "+ str(tab.get_non_basic()))
-            print("Variables associated to constraints : " + str(tab.varAssocToConstraint) +"\n")
-        inVar = simplex_choose_entering(tab)
+            print("Variables associated to constraints : " + str(tab.basisHead[1:]) +"\n")
+        if timed:
+            clock = perf_counter()
+        inVar = simplex_choose_entering(tab, pivotRule)
+        if timed:
+            clock = profiler.record("entering", clock)
         if inVar==-1:
             # We are done : no variable can improve the solution
             return tab
         else:
-            outVar = simplex_choose_leaving(tab, inVar)
+            status = monitor.limit_reached(tab)
+            if status is not None:
+                raise LimitReached(status)
+            outVar = simplex_choose_leaving(tab, inVar, test)
+            if timed:
+                clock = profiler.record("leaving", clock)
+            pivot = tab.get_column(inVar)[tab.basisPosition[outVar]] if iterationCallbacks else None
             tab.do_pivot(inVar, outVar)
+            if timed:
+                profiler.record("pivot", clock)
+            if iterationCallbacks:
+                notify_iteration(tab, phase, inVar, outVar, pivot)
+            event = monitor.update(tab)
+            if event is not None:
+                anti_cycling(event)
+                pivotRule, test = "Bland", "Bland"
         if verboseMode:
             print(tab)
     return
 
+def simplex_dual(tab, monitor=None):
+    """
+    Dual simplex, on a tableau whose reduced costs are all nonpositive.
+    Pivots until the right hand side is nonnegative : the tableau is then optimal.
+    When 'monitor' detects stalling or cycling, the leaving variable is chosen by Bland's rule
+    """
+    if monitor is None:
+        monitor = PivotMonitor(stallingLimit, cyclingWindow, maxIterations, timeLimit)
+    monitor.start_phase(tab)
+    timed = profiler is not None
+    while True:
+        if timed:
+            clock = perf_counter()
+        outVar = simplex_choose_leaving_dual(tab, monitor.stalled)
+        if timed:
+            clock = profiler.record("dual leaving", clock)
+        if outVar==-1:
+            return tab
+        status = monitor.limit_reached(tab)
+        if status is not None:
+            raise LimitReached(status)
+        inVar = simplex_choose_entering_dual(tab, outVar)
+        if timed:
+            clock = profiler.record("dual entering", clock)
+        pivot = tab.get_row(tab.basisPosition[outVar])[inVar-1] if iterationCallbacks else None
+        tab.do_pivot(inVar, outVar)
+        if timed:
+            profiler.record("pivot", clock)
+        if iterationCallbacks:
+            notify_iteration(tab, "dual", inVar, outVar, pivot)
+        event = monitor.update(tab)
+        if event is not None:
+            anti_cycling(event)
+        if verboseMode:
+            print(tab)
+
+def tableau_engine():
+    """ The class of the tableau. The InteriorPoint engine only builds one for its crossover """
+    return solverEngines[crossoverEngine if engine=="InteriorPoint" else engine]
+
+def warm_start(lp, basis):
+    """
+    Builds the tableau of 'lp' without artificial variables, and pivots the variables of 'basis' into it.
+    Returns None if the resulting basis is neither primal nor dual feasible :
+    the LP then has to be solved from scratch.
+    """
+    tab = tableau_engine()(lp, make_backend(), artificial=False)
+    try:
+        tab.set_basis(basis)
+    except ValueError: # singular basis (revised engine)
+        return None
+    if tab.is_primal_feasible() or tab.is_dual_feasible():
+        return tab
+    return None
+
+def build_tableau(lp, basis=None):
+    """
+    Builds the starting tableau of 'lp'. No artificial variable is added when the dual simplex
+    can start right away : from a warm start basis, or in dual mode when no coefficient
+    of the objective function is positive (the slack basis is then dual feasible).
+    Otherwise, artificial variables are added for the two phases method.
+    """
+    if basis is not None:
+        tab = warm_start(lp, basis)
+        if tab is not None:
+            return tab
+    if dualMode and all(x<=0 for x in lp.objectiveFunction):
+        return tableau_engine()(lp, make_backend(), artificial=False)
+    return tableau_engine()(lp, make_backend())
+
+def simplex_solve(lp, basis=None):
+    """
+    Solves 'lp' with the simplex algorithm and returns a SolveResult.
+    With a solution cache, the result of an LP already solved (up to the order of its rows and columns)
+    with the same backend, and giving a vertex or not, is given back without solving it.
+    An LP with the same constraint matrix as one already solved is warm started from its optimal basis,
+    unless 'basis' is given.
+    Nothing is printed, except in verbose mode.
+    """
+    if solutionCache is None:
+        return simplex_solve_presolved(lp, basis)
+    clock = perf_counter()
+    fingerprint = solutionCache.fingerprint(lp)
+    vertex = engine!="InteriorPoint" or crossover # interior point solutions are not vertices
+    result = solutionCache.get(fingerprint, backend, vertex)
+    if result is not None:
+        if verboseMode:
+            print("This linear program was already solved : its result is taken from the cache\n")
+        result.settings["solution cache"] = "hit, the LP was already solved"
+        result.timings = {"cache": perf_counter()-clock, "total": perf_counter()-clock}
+        return result
+    warm = False
+    if basis is None and not presolveMode: # the presolve ignores the starting basis
+        basis = solutionCache.get_basis(fingerprint)
+        warm = basis is not None
+        if verboseMode and warm:
+            print("An LP with the same constraints was already solved : its optimal basis is used as the starting basis\n")
+    lookupTime = perf_counter()-clock
+    result = simplex_solve_presolved(lp, basis)
+    if result.status not in ("IterationLimit", "TimeLimit"): # the result of a stopped resolution depends on the limits
+        solutionCache.put(fingerprint, result, backend, vertex)
+    result.settings["solution cache"] = "warm start from a similar LP" if warm else "miss"
+    result.timings["cache"] = lookupTime
+    result.timings["total"] += lookupTime
+    return result
+
+def simplex_solve_presolved(lp, basis=None):
+    """
+    In presolve mode, 'lp' is first reduced, and the solution of the reduced LP
+    is mapped back to the variables of 'lp'. 'basis' is then ignored.
+    """
+    if not presolveMode:
+        return simplex_solve_scaled(lp, basis)
+    clock = perf_counter()
+    presolve = Presolve(lp, verboseMode)
+    presolveTime = perf_counter()-clock
+    settings = {"pivot rule": rule, "solver engine": engine, "numeric backend": backend}
+    if presolve.status=="Optimal": # every variable was fixed : nothing is left for the simplex
+        solved = SolveResult("Optimal", objective=make_backend().scalar(0), solution=np.zeros(0, dtype=object), settings=settings)
+        result = presolve.postsolve(solved)
+    elif presolve.status is not None:
+        result = SolveResult(presolve.status, settings=settings)
+    else:
+        if verboseMode:
+            print("After presolve, {0} variables and {1} constraints are left\n".format(presolve.reducedLP.nbVar, presolve.reducedLP.nbConst))
+        result = presolve.postsolve(simplex_solve_scaled(presolve.reducedLP))
+    result.presolveLog = presolve.log
+    result.timings["presolve"] = presolveTime
+    result.timings["total"] = result.timings.get("total", 0)+presolveTime
+    return result
+
+def simplex_solve_scaled(lp, basis=None):
+    """
+    Scales 'lp' with the selected scaling method, solves the scaled LP,
+    and maps its solution back to the variables of 'lp'
+    """
+    solve = interior_point_solve if engine=="InteriorPoint" else simplex_solve_tableau
+    if scaling is None:
+        return solve(lp, basis)
+    clock = perf_counter()
+    scaler = Scaling(lp, scaling, exact=(backend=="Exact"))
+    scalingTime = perf_counter()-clock
+    if verboseMode:
+        print("Scaling : the coefficients of the matrix range over 2^{0:.0f} before scaling, 2^{1:.0f} after\n".format(scaler.rangeBefore, scaler.rangeAfter))
+    result = scaler.unscale(solve(scaler.scaledLP, basis))
+    result.settings["scaling"] = scaling
+    result.timings["scaling"] = scalingTime
+    result.timings["total"] += scalingTime
+    return result
 
-def simplex_solve(lp):
-    start_time = time()
-    print(lp)
-    tab = Tableau(lp)
+def simplex_solve_tableau(lp, basis=None):
+    """
+    Builds the tableau of 'lp' and runs the simplex algorithm on it. Returns a SolveResult.
+    'basis' is an optional starting basis, typically the basis of the SolveResult
+    of a previous solve, before some entries of b or c were modified :
+    after a change of c the basis is still primal feasible and the primal simplex resumes from it,
+    after a change of b it is still dual feasible and the dual simplex is run.
+    """
+    timings = dict()
+    start_time = clock = perf_counter()
+    monitor = PivotMonitor(stallingLimit, cyclingWindow, maxIterations, timeLimit)
+    tab = build_tableau(lp, basis)
+    timings["build"], clock = perf_counter()-clock, perf_counter()
     if verboseMode:
         print("The initial tableau is : \n")
         print(tab)
         if debugMode:
             print("Artificial variables : "+str(tab.artificialVariables)+"\n")
+    status = "Optimal"
+    phase = "phase2"
     try:
+        if not lp.need_2_phases and not tab.is_primal_feasible():
+            phase = "dual"
+            if verboseMode:
+                print("=========== DUAL SIMPLEX ==========\n")
+            tab = simplex_dual(tab, monitor)
+            timings["dual"], clock = perf_counter()-clock, perf_counter()
+            phase = "phase2"
         if lp.need_2_phases:
             # compute phase 1
+            phase = "phase1"
             if verboseMode:
                 print("=========== PHASE 1 ==========\n")
-            tab = simplex_one_phase(tab)
+            tab = simplex_one_phase(tab, "phase1", monitor)
             val = tab.get_value_of_solution()
-            if (val!=0):
+            if abs(val)>tab.backend.feasibilityTolerance:
                 raise Infeasible
             if debugMode:
                 print("END OF PHASE 1\n")
+            timings["phase1"], clock = perf_counter()-clock, perf_counter()
+            phase = "transition"
             tab.transition_phaseI_phaseII(lp.objectiveFunction, verboseMode, debugMode)
             if verboseMode:
                 print("\n========== PHASE 2 ==========\n")
                 print("After reloading the initial objective function, the tableau is:\n")
                 print(tab)
-        else:
-            print("The point (0,...,0) is a feasible solution. Only one phase is needed\n")
+            timings["transition"], clock = perf_counter()-clock, perf_counter()
+            phase = "phase2"
         # compute phase 2
-        tab = simplex_one_phase(tab)
-
+        tab = simplex_one_phase(tab, "phase2", monitor)
     except Infeasible:
-        print("This linear program in INFEASIBLE")
-        return
+        status = "Infeasible"
     except Unbounded:
-        print("This linear program is UNBOUNDED")
-        return
+        status = "Unbounded"
+    except LimitReached as e:
+        status = e.args[0]
+    timings[phase] = perf_counter()-clock
+    timings["total"] = perf_counter()-start_time
+
+    result = SolveResult(status, nbPivot=tab.nbPivot, timings=timings,
+                         settings={"pivot rule": rule, "solver engine": engine, "numeric backend": backend})
+    result.basis = tab.basisHead[1:].tolist()
+    result.nbDegenerate = monitor.nbDegenerate
+    result.stalled = monitor.stalled
+    if status=="Optimal":
+        result.objective = tab.get_value_of_solution()
+        result.solution = tab.get_solution_vector(lp.nbVar)
+    return result
+
+def interior_point_solve(lp, basis=None):
+    """
+    Solves 'lp' with the interior point method, and returns a SolveResult.
+    With crossover, the simplex then starts from the basis of the largest variables of the interior solution,
+    and gives an optimal vertex (exact with the Exact backend) in a few pivots. Whatever the status of
+    the interior point method, the simplex starts from this basis and gives the final status.
+    An LP without variables or without constraints is left to the simplex.
+    Without crossover, the solution is the float interior solution, and the basis can seed a later simplex.
+    'basis' is ignored : the interior point method can not be warm started.
+    """
+    if lp.nbVar==0 or lp.nbConst==0:
+        return simplex_solve_tableau(lp)
+    clock = perf_counter()
+    ipm = InteriorPoint(lp, interiorPointTolerance, interiorPointMaxIterations, verboseMode)
+    status = ipm.solve()
+    ipmTime = perf_counter()-clock
+    if verboseMode:
+        print("The interior point method stopped after {0} iterations, with status {1}\n".format(ipm.nbIterations, status))
+    if crossover:
+        result = simplex_solve_tableau(lp, ipm.crossover_basis())
+        result.settings["crossover engine"] = crossoverEngine
+    else:
+        result = SolveResult(status, basis=ipm.crossover_basis(), timings={"total": 0}, settings={"solver engine": engine})
+        if status=="Optimal":
+            result.objective = ipm.get_value_of_solution()
+            result.solution = ipm.get_solution_vector(lp.nbVar)
+    result.nbIterations = ipm.nbIterations
+    result.timings["interior point"] = ipmTime
+    result.timings["total"] += ipmTime
+    return result
+
+# =============== Multiple right hand sides =====================================
+
+def basis_factorization(lp, basis, numbers):
+    """
+    Factorization of the basis matrix of 'basis' in the standard form [A | I] of 'lp',
+    with the numeric backend 'numbers'. None if the basis holds artificial variables or is singular
+    """
+    n, m = lp.nbVar, lp.nbConst
+    if basis is None or any(x > n+m for x in basis):
+        return None
+    standard = numbers.zeros((m, n+m))
+    standard[:,0:n] = numbers.convert(lp.get_dense_matrix())
+    standard[:,n:] = numbers.convert(np.identity(m, dtype=int)) # slack variables
+    try:
+        return BasisFactorization(standard[:,[x-1 for x in basis]], numbers)
+    except ValueError:
+        return None
 
-    print("An optimal solution is : {0}".format(tab.get_solution_variables(lp.nbVar)))
-    print("The value of the objective for this solution is : {0}".format(tab.get_value_of_solution()) )
-    print("The number of pivots is : {0}".format(tab.nbPivot))
-    print("The pivot rule used : {0}".format(rule))
-    print("The calculation took {0:.3f} seconds".format(time()-start_time))
+def basic_solutions(lp, basis, values, numbers):
+    """
+    Solutions and objective values given by the values of the basic variables
+    (one column of 'values' per right hand side)
+    """
+    c = numbers.convert(lp.objectiveFunction)
+    cB = numbers.zeros(len(basis))
+    solutions = numbers.zeros((values.shape[1], lp.nbVar))
+    for i,x in enumerate(basis):
+        if x <= lp.nbVar:
+            cB[i] = c[x-1]
+            solutions[:,x-1] = values[i]
+    return solutions, np.dot(cB, values)
+
+def rhs_order(rhs):
+    """ Nearest neighbour order of the columns of 'rhs' : each one is followed by the closest remaining one """
+    points = rhs.astype(float).T
+    order = [0]
+    remaining = list(range(1, points.shape[0]))
+    while remaining:
+        distances = np.abs(points[remaining] - points[order[-1]]).sum(axis=1)
+        order.append(remaining.pop(int(np.argmin(distances))))
+    return order
+
+def simplex_solve_rhs(lp, rhs):
+    """
+    Solves 'lp' once for each column of 'rhs' used as right hand side.
+    Returns the list of the SolveResults, in the order of the columns.
+    The right hand sides are solved in nearest neighbour order, each one warm started
+    from the basis of the previous one. After each resolution, the basis is factorized once,
+    and the pending right hand sides for which it is still feasible are solved together as a block :
+    the reduced costs do not depend on b, so the basis is optimal for them too.
+    The presolve is not applied, since it would lose the basis.
+    """
+    numbers = make_backend()
+    rhs = numbers.convert(rhs)
+    results = [None]*rhs.shape[1]
+    basis = None
+    for j in rhs_order(rhs):
+        if results[j] is not None: # solved in a block
+            continue
+        scenario = LinearProgram.from_arrays(lp.objectiveFunction, rhs[:,j], lp.constraintMatrix)
+        results[j] = simplex_solve_scaled(scenario, basis)
+        if not results[j].is_optimal():
+            continue
+        basis = results[j].basis
+        pending = [k for k in range(rhs.shape[1]) if results[k] is None]
+        factorization = basis_factorization(lp, basis, numbers) if pending else None
+        if factorization is None:
+            continue
+        clock = perf_counter()
+        values = factorization.ftran(rhs[:,pending])
+        feasible = np.flatnonzero(np.all(values >= -numbers.feasibilityTolerance, axis=0))
+        solutions, objectives = basic_solutions(lp, basis, values[:,feasible], numbers)
+        blockTime = (perf_counter()-clock)/max(len(feasible), 1)
+        for p,k in enumerate(feasible):
+            results[pending[k]] = SolveResult("Optimal", objectives[p], solutions[p], list(basis), timings={"block": blockTime, "total": blockTime},
+                                              settings={"pivot rule": rule, "solver engine": engine, "numeric backend": backend})
+        if verboseMode:
+            print("The basis of right hand side {0} is optimal for {1} other right hand sides\n".format(j+1, len(feasible)))
+    return results
+
+def simplex_parametric(lp, direction, tMax=None):
+    """
+    Solves 'lp' with the right hand side b + t*d for every t of [0, tMax] (tMax=None for infinity).
+    Returns a ParametricResult : the segments of t on which the optimal basis does not change.
+    On a segment, the basic variables are B^-1 b + t B^-1 d. The segment ends when one of them reaches 0 :
+    this variable leaves the basis, and the entering variable is given by the dual ratio test,
+    so that the new basis is still optimal. If no variable can enter, the LP is infeasible for larger t
+    """
+    numbers = make_backend()
+    b = numbers.convert(lp.constraintVector)
+    d = numbers.convert(direction)
+    result = simplex_solve_scaled(lp)
+    if not result.is_optimal():
+        return ParametricResult(result.status)
+    # tableau without artificial variables on the optimal basis : its rows and reduced costs drive the pivots
+    tab = tableau_engine()(lp, numbers, artificial=False)
+    tab.set_basis(result.basis)
+    if tab.is_primal_feasible():
+        tab = simplex_one_phase(tab)
+    else:
+        tab = simplex_dual(tab)
+
+    segments = []
+    t = 0
+    while True:
+        basis = tab.basisHead[1:].tolist()
+        factorization = basis_factorization(lp, basis, numbers)
+        p = factorization.ftran(b)
+        q = factorization.ftran(d)
+        blocking = np.flatnonzero(q < -numbers.pivotTolerance)
+        end = None
+        if len(blocking):
+            limits = -p[blocking]/q[blocking]
+            end = limits.min()
+        if tMax is not None and (end is None or end >= tMax-numbers.feasibilityTolerance):
+            end = tMax
+        if end is None or end > t or end==tMax or not segments: # no empty segment, except for t=0
+            values, slopes = basic_solutions(lp, basis, np.stack([p, q], axis=1), numbers)
+            segments.append({"start": t, "end": end, "basis": basis, "objective": slopes[0], "slope": slopes[1],
+                             "solution": values[0], "slopeSolution": values[1]})
+        if end is None or end==tMax:
+            return ParametricResult("Optimal", segments)
+        t = end
+        # the basic variable of smallest index among those reaching 0 at t leaves the basis (no cycling)
+        outVar = min(basis[i] for i in blocking[limits==end])
+        try:
+            inVar = simplex_choose_entering_dual(tab, outVar)
+        except Infeasible:
+            return ParametricResult("Infeasible", segments)
+        tab.do_pivot(inVar, outVar)
+        if verboseMode:
+            print("For t = {0}, x_{1} leaves the basis and x_{2} enters it\n".format(frac_print(t), outVar, inVar))
 
 # ================== MAIN ======================================================
 if __name__ == '__main__':
 
     argparser = argparse.ArgumentParser(description='Implementation of the simplex algorithm. Done by Guillaume Coiffier. M1IF Opt&Approx 2017-2018 @ENS de Lyon')
     argparser.add_argument('filename', help="name of the source file.")
-    argparser.add_argument('-rule', help="specify the pivot's rule. Default is random", default="Random")
+    argparser.add_argument('-r', '-rule', dest='rule', help="specify the pivot's rule : Random, Bland, MaxCoeff, Custom, Devex, Partial or Multiple. Default is Random", default="Random")
+    argparser.add_argument('-ratio', help="specify the ratio test : Standard, Harris (two passes, with tolerance), Lexicographic (no cycling from the slack basis) or Bland (smallest basic index among the ties). Default is Standard", default="Standard")
+    argparser.add_argument('-engine', help="specify the solver engine : Tableau (full tableau), Revised (revised simplex with a factorized basis), Sparse (sparse full tableau), Integer (full tableau of integers, with fraction-free pivots) or InteriorPoint (Mehrotra's predictor-corrector method, then crossover to a vertex). Default is Tableau", default="Tableau")
+    argparser.add_argument('-backend', help="specify the numeric backend : Exact (fractions) or Float (float64). Default is Exact", default="Exact")
+    argparser.add_argument('-pivot-tol', type=float, help="Float backend only. Smallest absolute value accepted as a pivot", default=1e-9)
+    argparser.add_argument('-feas-tol', type=float, help="Float backend only. Tolerance used for feasibility and optimality tests", default=1e-9)
+    argparser.add_argument('-dual', action="store_true", help="when the objective function has no positive coefficient, solve with the dual simplex instead of the two phases method")
+    argparser.add_argument('-presolve', action="store_true", help="remove empty rows, zero columns, singleton rows, duplicate rows and fixed variables before building the tableau")
+    argparser.add_argument('-scaling', help="scale the rows and columns of the LP before solving it : Geometric or Equilibration. No scaling by default")
+    argparser.add_argument('-profile', action="store_true", help="print the time spent in each phase and in each operation of the simplex")
+    argparser.add_argument('-max-iter', type=int, help="stop after this number of pivots. No limit by default")
+    argparser.add_argument('-time-limit', type=float, help="stop after this time, in seconds. No limit by default")
+    argparser.add_argument('-stalling-limit', type=int, help="number of consecutive degenerate pivots after which Bland's rule is used for the entering and leaving variables. Default is 50", default=50)
+    argparser.add_argument('-rhs', help="file of right hand sides, one per line. The LP is solved for each of them, instead of its own right hand side")
+    argparser.add_argument('-parametric', help="file holding a direction d on one line. The LP is solved for the right hand sides b + t*d, t going from 0 to -t-max")
+    argparser.add_argument('-t-max', help="largest value of t for -parametric. No limit by default")
+    argparser.add_argument('-no-crossover', action="store_true", help="InteriorPoint engine only. Give the interior solution, in floats, without running the simplex from it")
+    argparser.add_argument('-cache', help="directory of the solution cache. The results of the LPs already solved are read from it, and the new results are written to it. No cache by default")
+    argparser.add_argument('-cache-size', type=float, help="largest size of the solution cache, in megabytes. The least recently used results are removed beyond it. Default is 100", default=100)
     argparser.add_argument('-v', action="store_true", help="enables verbose mode")
     argparser.add_argument('-d', action="store_true", help="enables debug mode")
 
@@ -164,6 +727,67 @@ if __name__ == '__main__':
             if debugMode:
                 print("The following pivot rule will be used : {}".format(rule))
 
+    if options.ratio not in ratioTests:
+        print("The ratio test '{0}' does not refer to any implemented ratio test. \n Possible ratio tests are {1} \n".format(options.ratio, ", ".join(ratioTests)))
+        raise Exception("No correct ratio test specified. Program will stop")
+    ratioTest = options.ratio
+
+    if options.engine not in engineNames:
+        print("The engine '{0}' does not refer to any implemented engine. \n Possible engines are {1} \n".format(options.engine, ", ".join(engineNames)))
+        raise Exception("No correct engine specified. Program will stop")
+    engine = options.engine
+
+    if options.backend not in numericBackends:
+        print("The backend '{0}' does not refer to any implemented backend. \n Possible backends are {1} \n".format(options.backend, ", ".join(numericBackends)))
+        raise Exception("No correct backend specified. Program will stop")
+    backend = options.backend
+    if engine=="Integer" and backend!="Exact":
+        print("The Integer engine computes with exact integers, it can not use the backend '{0}' \n".format(backend))
+        raise Exception("No correct backend specified. Program will stop")
+    pivotTolerance = options.pivot_tol
+    feasibilityTolerance = options.feas_tol
+    dualMode = options.dual
+    presolveMode = options.presolve
+    if options.scaling is not None and options.scaling not in scalingMethods:
+        print("The scaling '{0}' does not refer to any implemented scaling method. \n Possible methods are {1} \n".format(options.scaling, ", ".join(scalingMethods)))
+        raise Exception("No correct scaling specified. Program will stop")
+    scaling = options.scaling
+    if options.profile:
+        profiler = Profiler()
+    maxIterations = options.max_iter
+    timeLimit = options.time_limit
+    stallingLimit = options.stalling_limit
+    crossover = not options.no_crossover
+    if options.cache:
+        solutionCache = SolutionCache(options.cache, int(options.cache_size*2**20))
+
     filename = options.filename
-    my_lp = LinearProgram(filename) # open and parse the lp
-    simplex_solve(my_lp) # solve the lp using simplex algorithms
+    parse_time = perf_counter()
+    my_lp = LinearProgram(filename, sparse=(engine=="Sparse"), exact=(backend=="Exact")) # open and parse the lp
+    parse_time = perf_counter()-parse_time
+    print(my_lp)
+    if options.rhs or options.parametric:
+        vectors = read_vectors(options.rhs or options.parametric, exact=(backend=="Exact"))
+        if any(len(v)!=my_lp.nbConst for v in vectors):
+            print("Each vector of '{0}' must have {1} coefficients, one per constraint \n".format(options.rhs or options.parametric, my_lp.nbConst))
+            raise Exception("No correct right hand side specified. Program will stop")
+        if options.rhs:
+            for k,result in enumerate(simplex_solve_rhs(my_lp, np.stack(vectors, axis=1))):
+                print("====== Right hand side {0} : {1} ======".format(k+1, " ".join(frac_print(x) for x in vectors[k])))
+                print(str(result)+"\n")
+        else:
+            tMax = None if options.t_max is None else make_backend().scalar(Fraction(options.t_max))
+            print(simplex_parametric(my_lp, vectors[0], tMax))
+    else:
+        if all(x>=0 for x in my_lp.constraintVector):
+            print("The point (0,...,0) is a feasible solution. Only one phase is needed\n")
+        elif dualMode and all(x<=0 for x in my_lp.objectiveFunction):
+            print("The slack basis is dual feasible. The dual simplex will be used\n")
+        result = simplex_solve(my_lp) # solve the lp using simplex algorithms
+        result.timings["parse"] = parse_time
+        print(result)
+        if options.profile:
+            print("\nTime spent in each phase :")
+            for name,t in result.timings.items():
+                print("    {0:12} {1:10.4f} s".format(name, t))
+            print(profiler)
@@ -1,4 +1,20 @@
 # python module initializer. Manages the imports
-# Only the classes LinearProgram and Tableau should be used from the outside
+# Only the classes LinearProgram, SparseMatrix, SolveResult, ParametricResult, Presolve, Scaling, Profiler, PivotMonitor, SolutionCache, Fingerprint, the solver engines (Tableau, RevisedTableau, SparseTableau, IntegerTableau, InteriorPoint)
+# the numeric backends, BasisFactorization and read_vectors should be used from the outside
 from .linearProgram import LinearProgram
 from .tableau import Tableau
+from .revisedTableau import RevisedTableau, BasisFactorization
+from .sparseTableau import SparseTableau
+from .integerTableau import IntegerTableau
+from .interiorPoint import InteriorPoint
+from .sparseMatrix import SparseMatrix
+from .solveResult import SolveResult
+from .parametricResult import ParametricResult
+from .profiler import Profiler
+from .pivotMonitor import PivotMonitor
+from .presolve import Presolve
+from .solutionCache import SolutionCache, Fingerprint
+from .scaling import Scaling, scalingMethods
+from .backend import ExactBackend, FloatBackend, numericBackends
+from .lpFile import read_vectors
+from .utilities import frac_print
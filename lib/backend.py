@@ -0,0 +1,91 @@
+from fractions import *
+import numpy as np
+
+# ======================= Numeric backends =====================================
+# A backend describes how the cells of a tableau are stored and how a pivot
+# is applied to them. The Tableau class only talks to its backend, so that the
+# simplex driver does not depend on the arithmetic being exact or not.
+
+class ExactBackend:
+    """
+    Exact rational arithmetic : every cell of the tableau is a Fraction.
+    Comparisons are exact, so both tolerances are zero.
+    """
+    name = "Exact"
+    dtype = object
+
+    def __init__(self):
+        self.pivotTolerance = 0
+        self.feasibilityTolerance = 0
+
+    def convert(self, values):
+        """ Returns a copy of 'values' as an array of this backend """
+        values = np.asarray(values)
+        if values.dtype!=object:
+            values = values.astype(object) # python ints (or floats), numpy scalars would overflow
+        return np.array([self.scalar(x) for x in values.flat], dtype=object).reshape(values.shape)
+
+    def scalar(self, x):
+        if isinstance(x, np.generic):
+            x = x.item()
+        return Fraction(x)
+
+    def zeros(self, shape):
+        return np.full(shape, Fraction(0,1), dtype=object)
+
+    def pivot(self, data, leavingInd, enteringInd):
+        """
+        Gaussian pivot on data[leavingInd, enteringInd], row by row.
+        Only the rows with a nonzero entry in the entering column are updated,
+        and only on the nonzero columns of the pivot row.
+        """
+        data[leavingInd,:] /= data[leavingInd,enteringInd] # renormalize
+        pivotRow = data[leavingInd,:]
+        cols = np.flatnonzero(pivotRow)
+        for i in np.flatnonzero(data[:,enteringInd]): #apply pivot
+            if i != leavingInd:
+                data[i,cols] -= pivotRow[cols]*data[i,enteringInd]
+
+
+class FloatBackend:
+    """
+    Floating point arithmetic : the tableau is a contiguous float64 array.
+    - pivotTolerance : entries smaller than this are never chosen as pivots
+    - feasibilityTolerance : values within this distance of 0 are considered as 0
+    """
+    name = "Float"
+    dtype = np.float64
+
+    def __init__(self, pivotTolerance=1e-9, feasibilityTolerance=1e-9):
+        self.pivotTolerance = pivotTolerance
+        self.feasibilityTolerance = feasibilityTolerance
+
+    def convert(self, values):
+        """ Returns a copy of 'values' as an array of this backend """
+        values = np.asarray(values)
+        if values.dtype!=object:
+            return values.astype(np.float64)
+        return np.array([float(x) for x in values.flat], dtype=np.float64).reshape(values.shape)
+
+    def scalar(self, x):
+        return float(x)
+
+    def zeros(self, shape):
+        return np.zeros(shape, dtype=np.float64)
+
+    def pivot(self, data, leavingInd, enteringInd):
+        """
+        Gaussian pivot on data[leavingInd, enteringInd],
+        done as a single rank-1 update of the rows having a nonzero
+        entry in the entering column.
+        """
+        data[leavingInd,:] /= data[leavingInd,enteringInd] # renormalize
+        rows = np.flatnonzero(data[:,enteringInd])
+        rows = rows[rows!=leavingInd]
+        data[rows] -= np.outer(data[rows,enteringInd], data[leavingInd,:])
+        # the entering column is exactly a unit vector, whatever the rounding errors
+        data[:,enteringInd] = 0
+        data[leavingInd,enteringInd] = 1
+
+
+numericBackends = {"Exact": ExactBackend, "Float": FloatBackend}
@@ -0,0 +1,155 @@
+import numpy as np
+from fractions import *
+from math import lcm
+from .utilities import *
+from .tableau import Tableau
+from .backend import ExactBackend
+
+# ========================== IntegerTableau Class ==============================
+class IntegerTableau(Tableau):
+    """
+    Implementation of the full tableau method with fraction-free (Bareiss) pivots.
+    The tableau is stored as a matrix of python integers M, with one common denominator d
+    (the determinant of the current basis) : the constraint rows of the tableau are M/d,
+    and its top row is M[0]/(d*objScale).
+    A pivot on (r,q) with p = M[r,q] only does integer operations :
+        M[i] <- (p*M[i] - M[i,q]*M[r])/d    for i != r, the division being exact
+    and d becomes p. No gcd is ever computed on the cells, and the cells stay as small
+    as the minors of the initial matrix. The values are exactly those of the Fraction tableau.
+    The pricing and the ratio tests read the cells through the scaled getters : d > 0 and objScale > 0
+    keep their signs and their order. Fractions are only built by the exact getters, and for the ratios.
+    """
+    __slots__ = ("denominator", "objScale", "reducedCosts", "rhsColumn")
+
+    def __init__(self, lp, backend=None, artificial=True):
+        """
+        Builds the same initial tableau as the Tableau class, then multiplies
+        it by the lcm of the denominators of its rows to get integers
+        """
+        Tableau.__init__(self, lp, backend if backend is not None else ExactBackend(), artificial)
+        denominators = [lcm(*[x.denominator for x in self.data[i]]) for i in range(1,self.height)]
+        self.denominator = 1 # determinant of the basis of the system whose row i is multiplied by denominators[i-1]
+        for L in denominators:
+            self.denominator *= L
+        self.objScale = lcm(*[x.denominator for x in self.data[0]])
+        self.data = self.to_integers(self.data, self.denominator, self.objScale)
+        self.clear_cache()
+
+    def to_integers(self, data, d, objScale):
+        """ The integer matrix d*data, whose top row is also multiplied by objScale """
+        M = np.empty(data.shape, dtype=object)
+        for i in range(data.shape[0]):
+            f = d*objScale if i==0 else d
+            M[i] = [int(x*f) for x in data[i]]
+        return M
+
+    def fractions(self, values, denominator):
+        return np.array([Fraction(int(x), denominator) for x in values], dtype=object)
+
+    def clear_cache(self):
+        self.reducedCosts = None
+        self.rhsColumn = None
+
+    def get_reduced_costs(self):
+        if self.reducedCosts is None:
+            self.reducedCosts = self.fractions(self.data[0,0:-1], self.denominator*self.objScale)
+        return self.reducedCosts
+
+    def get_reduced_costs_of(self, cols):
+        if self.reducedCosts is not None:
+            return self.reducedCosts[cols]
+        return self.fractions(self.data[0,cols], self.denominator*self.objScale)
+
+    def get_column(self, x):
+        col = self.fractions(self.data[:,x-1], self.denominator)
+        col[0] = Fraction(self.data[0,x-1], self.denominator*self.objScale)
+        return col
+
+    def get_value_of_solution(self):
+        return -Fraction(self.data[0,-1], self.denominator*self.objScale)
+
+    def get_rhs(self):
+        if self.rhsColumn is None:
+            self.rhsColumn = self.get_column(self.width)
+        return self.rhsColumn
+
+    def get_row(self, i):
+        return self.fractions(self.data[i,0:-1], self.denominator*(self.objScale if i==0 else 1))
+
+    def get_scaled_reduced_costs(self):
+        return self.data[0,0:-1]
+
+    def get_scaled_reduced_costs_of(self, cols):
+        return self.data[0,cols]
+
+    def get_scaled_column(self, x):
+        return self.data[:,x-1]
+
+    def get_scaled_rhs(self):
+        return self.data[:,-1]
+
+    def get_scaled_row(self, i):
+        return self.data[i,0:-1]
+
+    def ratios(self, num, den):
+        """ The quotients of two arrays of integers, as Fractions : the ratio tests only build them on their candidate rows """
+        return np.array([Fraction(int(a), int(b)) for a,b in zip(num, den)], dtype=object)
+
+    def column_dots(self, col, cols):
+        d = self.denominator
+        return np.dot(col[1:], self.data[1:,cols])/d + col[0]*self.data[0,cols]/(d*self.objScale)
+
+    def compute_column_norms(self):
+        M = self.data[:,0:-1]
+        K = self.objScale
+        sums = np.sum(M[1:]*M[1:], axis=0)*K*K + M[0]*M[0]
+        return self.fractions(sums, (self.denominator*K)**2)
+
+    def to_array(self):
+        data = np.empty(self.data.shape, dtype=object)
+        data[0] = self.get_row(0).tolist()+[self.get_rhs()[0]]
+        for i in range(1,self.height):
+            data[i] = self.fractions(self.data[i], self.denominator)
+        return data
+
+    def do_pivot(self, enteringVar, leavingVar):
+        """
+        Apply the pivot.
+        enteringVar -> the variable that will replace leavingVar in the basis.
+        """
+        self.update_pricing(enteringVar, leavingVar)
+        leavingInd = self.update_basis(enteringVar, leavingVar)
+        q = enteringVar-1
+        M = self.data
+        p = M[leavingInd,q]
+        d = self.denominator
+
+        col = M[:,q].copy()
+        rows = np.flatnonzero(col)
+        rows = rows[rows!=leavingInd]
+        others = np.flatnonzero(col==0)
+        M[rows] = (p*M[rows] - np.outer(col[rows], M[leavingInd]))//d # exact divisions
+        M[others] = (p*M[others])//d
+        if p<0: # the denominator is kept positive, so that M has the signs of the tableau
+            M *= -1
+            p = -p
+        self.denominator = p
+        self.clear_cache()
+
+    def remove_artificial_variables(self):
+        Tableau.remove_artificial_variables(self)
+        self.clear_cache()
+
+    def set_objective(self, objfunc):
+        """ The top row of 'objfunc' in the current basis, with the scale objScale of the denominators of 'objfunc' """
+        d = self.denominator
+        c = [Fraction(x) for x in objfunc]
+        self.objScale = lcm(*[x.denominator for x in c])
+        top = np.zeros(self.width, dtype=object)
+        top[0:len(c)] = [int(x*self.objScale)*d for x in c]
+        for i in range(1,self.height):
+            x = self.basisHead[i]
+            if x-1 < len(c) and c[x-1]!=0:
+                top -= int(c[x-1]*self.objScale)*self.data[i]
+        self.data[0] = top
+        self.clear_cache()
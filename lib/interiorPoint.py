@@ -0,0 +1,200 @@
+import numpy as np
+from .utilities import *
+from .linearProgram import LinearProgram
+
+# ========================= InteriorPoint Class ================================
+class InteriorPoint:
+    """
+    Primal-dual interior point method (Mehrotra's predictor-corrector) in float64.
+    The LP max c.x, Ax <= b, x >= 0 is written with its slack variables as
+    min -c.x, [A I]x = b, x >= 0, whose dual is max b.y, [A I]^T y + s = -c, s >= 0.
+    Each iteration solves the normal equations A*D*A^T dy = r, D = X/S, twice (predictor and corrector) :
+    the number of iterations barely depends on the size of the LP, unlike the number of pivots of the simplex.
+    The iterates stay in the interior of the feasible region, so the solution is not a vertex :
+    crossover_basis gives a basis from which the simplex can finish.
+    Contains the following datas :
+        - x, y, s : the current primal, dual and dual slack iterates
+        - status : None while solving, then "Optimal", "Infeasible", "Unbounded",
+          or "IterationLimit" if it did not converge within maxIterations or the normal equations became singular.
+          On an infeasible or unbounded LP the iterates diverge : once a step would overflow, it is not taken,
+          and the status is decided from the last finite iterate (see diverged)
+        - nbIterations : the number of iterations done
+        - primalResidual : the smallest relative primal residual |b-Ax|/(1+|b|) of the iterates
+    """
+
+    def __init__(self, lp, tolerance=1e-8, maxIterations=100, verboseMode=False):
+        self.nbVar = lp.nbVar
+        self.nbConst = lp.nbConst
+        self.A = np.hstack([np.asarray(lp.get_dense_matrix(), dtype=float).reshape(lp.nbConst, lp.nbVar), np.eye(lp.nbConst)])
+        self.b = np.asarray(lp.constraintVector, dtype=float)
+        self.c = np.concatenate([-np.asarray(lp.objectiveFunction, dtype=float), np.zeros(lp.nbConst)])
+        self.tolerance = tolerance
+        self.maxIterations = maxIterations
+        self.verboseMode = verboseMode
+        self.status = None
+        self.nbIterations = 0
+        self.primalResidual = np.inf
+        self.starting_point()
+
+    def starting_point(self):
+        """
+        Mehrotra's starting point : the least squares solutions, shifted to be positive and well centered.
+        When b or c is 0, x or s would be 0 : it is replaced by ones
+        """
+        A, b, c = self.A, self.b, self.c
+        M = A @ A.T
+        x = A.T @ np.linalg.solve(M, b)
+        y = np.linalg.solve(M, A @ c)
+        s = c - A.T @ y
+        x += max(-1.5*x.min(), 0)
+        s += max(-1.5*s.min(), 0)
+        if x.sum()==0:
+            x = np.ones(len(x))
+        if s.sum()==0:
+            s = np.ones(len(s))
+        xs = x @ s
+        self.x = x + 0.5*xs/s.sum()
+        self.y = y
+        self.s = s + 0.5*xs/x.sum()
+
+    # _____ Iterations ______
+    def newton_direction(self, M, rb, rc, rxs):
+        """
+        The solution of A dx = rb, A^T dy + ds = rc, S dx + X ds = rxs,
+        through the normal equations M dy = rb - A*(rxs - X rc)/s
+        """
+        dy = np.linalg.solve(M, rb - self.A @ ((rxs - self.x*rc)/self.s))
+        ds = rc - self.A.T @ dy
+        dx = (rxs - self.x*ds)/self.s
+        return dx, dy, ds
+
+    @staticmethod
+    def step_length(v, dv):
+        """ The largest step in [0,1] keeping v + step*dv nonnegative """
+        neg = dv < 0
+        if not neg.any():
+            return 1.0
+        return min(1.0, float((-v[neg]/dv[neg]).min()))
+
+    def solve(self):
+        """ Iterates until the residuals and the duality gap are below the tolerance. Returns the status """
+        A, b, c = self.A, self.b, self.c
+        normB, normC = 1+np.linalg.norm(b), 1+np.linalg.norm(c)
+        bigValue = 1e10*(1+max(np.abs(b).max(initial=0), np.abs(c).max(initial=0)))
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'): # each new iterate is checked to be finite
+            while self.status is None:
+                x, y, s = self.x, self.y, self.s
+                rb = b - A @ x
+                rc = c - A.T @ y - s
+                primalValue, dualValue = c @ x, b @ y
+                gap = abs(primalValue-dualValue)/(1+abs(primalValue))
+                self.primalResidual = min(self.primalResidual, np.linalg.norm(rb)/normB)
+                if self.verboseMode:
+                    print("Iteration {0} : primal residual {1:.3e}, dual residual {2:.3e}, gap {3:.3e}".format(
+                          self.nbIterations, np.linalg.norm(rb)/normB, np.linalg.norm(rc)/normC, gap))
+                if np.linalg.norm(rb)/normB < self.tolerance and np.linalg.norm(rc)/normC < self.tolerance and gap < self.tolerance:
+                    self.status = "Optimal"
+                elif max(np.abs(x).max(), np.abs(y).max()) > bigValue and self.certificate() is not None:
+                    self.status = self.certificate()
+                elif self.nbIterations >= self.maxIterations:
+                    self.status = "IterationLimit"
+                else:
+                    try:
+                        if not self.iterate(rb, rc):
+                            self.status = self.diverged()
+                    except np.linalg.LinAlgError: # the normal equations became singular
+                        self.status = self.certificate() or "IterationLimit"
+        return self.status
+
+    def certificate(self):
+        """
+        "Infeasible" if y/max|y| proves it (Farkas' lemma : A^T y <= 0 and b.y > 0),
+        "Unbounded" if the LP is feasible and x/max|x| is a direction d >= 0 with A d = 0
+        along which the objective improves. None otherwise.
+        An improving direction alone proves nothing when the LP is infeasible. Once the iterates diverge,
+        the rounding errors on the large x prevent their residual from going below the tolerance :
+        the LP is taken as feasible when the smallest residual reached is below its square root
+        """
+        y = self.y/np.abs(self.y).max()
+        if (self.A.T @ y).max() < self.tolerance and self.b @ y > self.tolerance:
+            return "Infeasible"
+        if self.primalResidual >= np.sqrt(self.tolerance):
+            return None
+        d = self.x/np.abs(self.x).max()
+        if np.abs(self.A @ d).max() < self.tolerance and self.c @ d < -self.tolerance:
+            return "Unbounded"
+        return None
+
+    def diverged(self):
+        """
+        Status of an LP whose iterates diverged without a certificate (the next step overflows).
+        If x/max|x| is an improving direction, the LP is unbounded if it is feasible, and infeasible otherwise :
+        its feasibility is decided by the interior point method with a zero objective, which can not diverge in the same way.
+        "IterationLimit" if no conclusion can be drawn
+        """
+        status = self.certificate()
+        if status is not None:
+            return status
+        d = self.x/np.abs(self.x).max()
+        if not (np.abs(self.A @ d).max() < self.tolerance and self.c @ d < -self.tolerance):
+            return "IterationLimit"
+        if self.verboseMode:
+            print("The iterates diverge along an improving direction : the feasibility of the LP is checked\n")
+        feasibility = InteriorPoint(LinearProgram.from_arrays(np.zeros(self.nbVar), self.b, self.A[:,:self.nbVar]),
+                                    self.tolerance, self.maxIterations)
+        status = feasibility.solve()
+        if status=="Optimal" or feasibility.primalResidual < np.sqrt(self.tolerance):
+            return "Unbounded"
+        if status=="Infeasible":
+            return "Infeasible"
+        return "IterationLimit"
+
+    def iterate(self, rb, rc):
+        """ One predictor-corrector step. Returns False, without taking the step, if it would overflow """
+        x, s = self.x, self.s
+        N = len(x)
+        mu = x @ s/N
+        M = (self.A*(x/s)) @ self.A.T
+        # predictor : the affine scaling direction
+        dxAff, dyAff, dsAff = self.newton_direction(M, rb, rc, -x*s)
+        alphaP, alphaD = self.step_length(x, dxAff), self.step_length(s, dsAff)
+        muAff = (x+alphaP*dxAff) @ (s+alphaD*dsAff)/N
+        sigma = (muAff/mu)**3
+        # corrector : second order term, and centering
+        dx, dy, ds = self.newton_direction(M, rb, rc, -x*s - dxAff*dsAff + sigma*mu)
+        alphaP, alphaD = 0.99*self.step_length(x, dx), 0.99*self.step_length(s, ds)
+        x, y, s = x + min(1.0, alphaP)*dx, self.y + min(1.0, alphaD)*dy, s + min(1.0, alphaD)*ds
+        if not (np.isfinite(x).all() and np.isfinite(y).all() and np.isfinite(s).all()):
+            return False
+        self.x, self.y, self.s = x, y, s
+        self.nbIterations += 1
+        return True
+
+    # _____ Results ______
+    def get_solution_vector(self, n):
+        """ Returns the values of the n first variables """
+        return self.x[:n].copy()
+
+    def get_value_of_solution(self):
+        return -self.c @ self.x
+
+    def crossover_basis(self):
+        """
+        A basis to start the simplex from : the columns of [A I] are taken by decreasing x_j/(x_j+s_j),
+        which is close to 1 for the basic variables of an optimal vertex and to 0 for the others,
+        skipping the columns which depend on the ones already taken. The slack columns complete the basis.
+        """
+        order = np.argsort(-self.x/(self.x+self.s), kind="stable")
+        Q = np.zeros((self.nbConst, self.nbConst))
+        basis = []
+        for j in order:
+            if len(basis)==self.nbConst:
+                break
+            a = self.A[:,j]
+            r = a - Q[:,:len(basis)] @ (Q[:,:len(basis)].T @ a) # Gram-Schmidt
+            r = r - Q[:,:len(basis)] @ (Q[:,:len(basis)].T @ r)
+            norm = np.linalg.norm(r)
+            if norm > 1e-9*np.linalg.norm(a):
+                Q[:,len(basis)] = r/norm
+                basis.append(int(j)+1)
+        return basis
@@ -1,6 +1,8 @@
 from fractions import *
 import numpy as np
 from .utilities import *
+from .sparseMatrix import SparseMatrix
+from .lpFile import *
 
 # ======================= LinearProgram Class ==================================
 class LinearProgram:
@@ -11,29 +13,59 @@ class LinearProgram:
         - nbConst : number of constraints
         - objectiveFunction : the vector c such that transpose(c)*x is the objective value
         - objectiveVector : the vector b such that constraint i is <= b
-        - constraintMatrix
+        - constraintMatrix : a dense array, or a SparseMatrix if the LP was read with sparse=True
+    Integer coefficients are stored in int64 arrays, the others as Fractions (or floats if exact=False)
     """
 
     # _____ Parsing and initialisation _____
-    def __init__(self,filename):
-        # retrieving data from file
-        f = open(filename, 'r')
-        input_data = [ s.strip() for s in f.readlines()]
-        f.close()
+    def __init__(self,filename,sparse=False,exact=True):
+        """
+        Reads the linear program of 'filename', in the text or in the binary format (see lpFile).
+        Integer coefficients are kept in int64 arrays, without building any Fraction.
+        If 'exact' is False, non integer coefficients are read as floats instead of Fractions.
+        """
+        if is_binary(filename):
+            self.nbVar, self.nbConst, self.objectiveFunction, self.constraintVector, matrix = read_binary(filename)
+            if sparse:
+                matrix = SparseMatrix(self.nbConst, self.nbVar, [{j:x for j,x in enumerate(line.tolist()) if x!=0} for line in matrix])
+        elif sparse:
+            rows = []
+            def add_row(i, line):
+                rows.append({j:x for j,x in enumerate(line.tolist()) if x!=0})
+            self.nbVar, self.nbConst, self.objectiveFunction, self.constraintVector, matrix = read_text(filename, exact, add_row)
+            matrix = SparseMatrix(self.nbConst, self.nbVar, rows)
+        else:
+            self.nbVar, self.nbConst, self.objectiveFunction, self.constraintVector, matrix = read_text(filename, exact)
+        self.constraintMatrix = matrix
+        self.need_2_phases = False # Real value set at computation of the standard form of the LP
 
-        # formatting to build a LinearProgram object
-        self.nbVar = int(input_data[0])
-        self.nbConst = int(input_data[1])
-        self.objectiveFunction = np.array([convert(u) for u in input_data[2].strip().split()])
-        self.constraintVector = np.array([convert(u) for u in input_data[3].strip().split()])
-        self.constraintMatrix = np.array([Fraction(0,1)]*self.nbVar*self.nbConst).reshape((self.nbConst,self.nbVar))
-        for i in range(self.nbConst):
-            l = [convert(u) for u in input_data[4+i].strip().split()]
-            for j in range(self.nbVar):
-                self.constraintMatrix[i,j]=l[j]
+    @classmethod
+    def from_arrays(cls, objectiveFunction, constraintVector, constraintMatrix):
+        """ Builds a linear program directly from its arrays c, b and A (dense or SparseMatrix) """
+        lp = cls.__new__(cls)
+        lp.objectiveFunction = np.asarray(objectiveFunction)
+        lp.constraintVector = np.asarray(constraintVector)
+        lp.constraintMatrix = constraintMatrix if isinstance(constraintMatrix, SparseMatrix) else np.asarray(constraintMatrix)
+        lp.nbVar = len(lp.objectiveFunction)
+        lp.nbConst = len(lp.constraintVector)
+        lp.need_2_phases = False
+        return lp
 
-        self.need_2_phases = False # Real value set at computation of the standard form of the LP
-        f.close()
+    def save(self, filename, binary=False):
+        """ Writes the linear program in the text format, or in the binary format """
+        if binary:
+            write_binary(filename, self.objectiveFunction, self.constraintVector, self.get_dense_matrix())
+        else:
+            write_text(filename, self.objectiveFunction, self.constraintVector, self.get_dense_matrix())
+
+    def is_sparse(self):
+        return isinstance(self.constraintMatrix, SparseMatrix)
+
+    def get_dense_matrix(self):
+        """ The constraint matrix as a dense array, whatever its storage """
+        if self.is_sparse():
+            return self.constraintMatrix.toarray()
+        return self.constraintMatrix
 
     # _____ Output fontions ______
     def __str__(self):
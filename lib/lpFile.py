@@ -0,0 +1,154 @@
+from fractions import *
+import struct
+from numbers import Rational
+import numpy as np
+from .utilities import *
+
+# ======================= LP file formats ======================================
+# Text format : nbVar, nbConst, the objective function, the constraint vector
+# and then one line per row of the constraint matrix. Coefficients are written
+# as [-]a[/b] (decimals such as 1.5 are also accepted).
+#
+# Binary format : a header of HEADER_SIZE bytes
+#       magic (4 bytes) | version (uint32) | nbVar (int64) | nbConst (int64) | dtype code (uint32) | padding
+# followed by the raw little endian arrays c (nbVar), b (nbConst) and A (nbConst*nbVar, row by row).
+# For the "int64" and "float64" codes the arrays hold the values, and can be memory mapped.
+# For the "rational" code, the int64 numerators of c, b and A are followed by their denominators.
+
+MAGIC = b"SLPB"
+VERSION = 1
+HEADER_FORMAT = "<4sIqqI"
+HEADER_SIZE = 32
+DTYPE_CODES = {1: "int64", 2: "float64", 3: "rational"}
+
+def parse_line(line, exact=True):
+    """
+    Parses a line of coefficients.
+    Integers are read directly into an int64 array, without building any Fraction.
+    Otherwise, the coefficients are read as Fractions, or as float64 numbers if 'exact' is False.
+    """
+    tokens = line.split()
+    try:
+        return np.array(tokens, dtype=np.int64)
+    except (ValueError, OverflowError):
+        pass
+    if exact:
+        return np.array([convert(u) for u in tokens], dtype=object)
+    return np.array([float(convert(u)) for u in tokens], dtype=np.float64)
+
+def read_vectors(filename, exact=True):
+    """ Reads a file holding one vector per line (for instance right hand sides). Returns the list of the vectors """
+    with open(filename, 'r') as f:
+        return [parse_line(s, exact) for s in f if s.strip()]
+
+def merge_dtype(array, values):
+    """ Returns 'array', converted if necessary so that it can hold 'values' """
+    if array.dtype==values.dtype or array.dtype==object:
+        return array
+    if values.dtype==object:
+        return np.array([Fraction(x) for x in array.astype(object).flat], dtype=object).reshape(array.shape)
+    return array.astype(np.float64)
+
+def read_text(filename, exact=True, rowHandler=None):
+    """
+    Streaming parser of the text format.
+    Returns (nbVar, nbConst, objectiveFunction, constraintVector, constraintMatrix).
+    The matrix is filled row by row into an int64 array, which is converted
+    only if a row needs Fractions (or floats).
+    If 'rowHandler' is given, it is called on each row instead, and no matrix is built.
+    """
+    with open(filename, 'r') as f:
+        def next_line(name):
+            """ The lines are read by position : an empty line is an empty vector """
+            line = f.readline()
+            if not line:
+                raise ValueError("{0} ends before {1}".format(filename, name))
+            return line
+        nbVar = int(next_line("the number of variables"))
+        nbConst = int(next_line("the number of constraints"))
+        objectiveFunction = parse_line(next_line("the objective function"), exact)
+        constraintVector = parse_line(next_line("the constraint vector"), exact)
+        constraintMatrix = None
+        if rowHandler is None:
+            constraintMatrix = np.zeros((nbConst, nbVar), dtype=np.int64)
+        for i in range(nbConst):
+            row = parse_line(next_line("row {0} of the constraint matrix".format(i+1)), exact)
+            if len(row)!=nbVar:
+                raise ValueError("Row {0} of the constraint matrix has {1} coefficients instead of {2}".format(i+1, len(row), nbVar))
+            if rowHandler is not None:
+                rowHandler(i, row)
+            else:
+                constraintMatrix = merge_dtype(constraintMatrix, row)
+                constraintMatrix[i] = row
+    return nbVar, nbConst, objectiveFunction, constraintVector, constraintMatrix
+
+def format_coefficient(x):
+    """ A coefficient in the text format. Floats are written with all their digits (frac_print rounds them) """
+    if isinstance(x, Rational):
+        return frac_print(x)
+    return repr(float(x))
+
+def write_text(filename, objectiveFunction, constraintVector, constraintMatrix):
+    """ Writes a linear program in the text format """
+    with open(filename, 'w') as f:
+        f.write("{0}\n{1}\n".format(len(objectiveFunction), len(constraintVector)))
+        f.write(" ".join(format_coefficient(x) for x in objectiveFunction)+"\n")
+        f.write(" ".join(format_coefficient(x) for x in constraintVector)+"\n")
+        for i in range(len(constraintVector)):
+            f.write(" ".join(format_coefficient(x) for x in constraintMatrix[i,:])+"\n")
+
+def is_binary(filename):
+    """ True if the file is in the binary format """
+    with open(filename, 'rb') as f:
+        return f.read(len(MAGIC))==MAGIC
+
+def read_binary(filename):
+    """
+    Reads a file of the binary format.
+    Returns (nbVar, nbConst, objectiveFunction, constraintVector, constraintMatrix).
+    Integer and float files are memory mapped (read only) : nothing is copied.
+    """
+    with open(filename, 'rb') as f:
+        magic, version, nbVar, nbConst, code = struct.unpack(HEADER_FORMAT, f.read(struct.calcsize(HEADER_FORMAT)))
+    if magic!=MAGIC or version!=VERSION or code not in DTYPE_CODES:
+        raise ValueError("{0} is not a valid binary LP file".format(filename))
+    kind = DTYPE_CODES[code]
+    dtype = np.dtype("<f8") if kind=="float64" else np.dtype("<i8")
+    sizes = [nbVar, nbConst, nbVar*nbConst]
+    if kind=="rational":
+        sizes = sizes*2
+    arrays = []
+    offset = HEADER_SIZE
+    for size in sizes:
+        arrays.append(np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(size,)) if size else np.zeros(0, dtype))
+        offset += size*dtype.itemsize
+    if kind=="rational":
+        arrays = [np.array([Fraction(int(p),int(q)) for p,q in zip(num,den)], dtype=object)
+                    for num,den in zip(arrays[0:3], arrays[3:6])]
+    c, b, A = arrays
+    return nbVar, nbConst, c, b, A.reshape((nbConst, nbVar))
+
+def write_binary_header(f, nbVar, nbConst, code):
+    """ Writes the header of the binary format to the open file f. The arrays have to follow it """
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, nbVar, nbConst, code)
+    f.write(header + b"\0"*(HEADER_SIZE-len(header)))
+
+def write_binary(filename, objectiveFunction, constraintVector, constraintMatrix):
+    """ Writes a linear program in the binary format """
+    arrays = [np.asarray(objectiveFunction), np.asarray(constraintVector), np.asarray(constraintMatrix)]
+    nbVar, nbConst = len(arrays[0]), len(arrays[1])
+    if all(a.dtype.kind in "iu" for a in arrays):
+        code, data = 1, [a.astype("<i8") for a in arrays]
+    elif all(a.dtype.kind in "iuf" for a in arrays):
+        code, data = 2, [a.astype("<f8") for a in arrays]
+    else:
+        values = [[Fraction(x) for x in a.flat] for a in arrays]
+        if any(isinstance(x, float) for x in values[0]+values[1]+values[2]):
+            raise ValueError("Mixed float and fraction coefficients can not be written in the binary format")
+        code = 3
+        data = [np.array([x.numerator for x in v], dtype="<i8") for v in values]
+        data += [np.array([x.denominator for x in v], dtype="<i8") for v in values]
+    with open(filename, 'wb') as f:
+        write_binary_header(f, nbVar, nbConst, code)
+        for a in data:
+            f.write(np.ascontiguousarray(a).tobytes())
@@ -0,0 +1,55 @@
+from .utilities import *
+
+# ======================= ParametricResult Class ===============================
+class ParametricResult:
+    """
+    Result of the resolution of a linear program whose right hand side is b + t*d,
+    for t going from 0 to tMax (or to infinity).
+    Contains the following datas :
+        - status : "Optimal" if the LP has an optimal solution for every t of [0, tMax],
+          "Infeasible" if it becomes infeasible after the last segment,
+          or the status of the LP for t=0 if it has no optimal solution
+        - segments : one dict per interval [start, end] of t on which the optimal basis does not change.
+          On this interval, the solution is solution + t*slopeSolution,
+          and the objective value is objective + t*slope. 'end' is None for infinity
+        - breakpoints : the values of t at which the optimal basis changes
+    """
+
+    def __init__(self, status, segments=None):
+        self.status = status
+        self.segments = segments if segments is not None else []
+
+    @property
+    def breakpoints(self):
+        return [s["end"] for s in self.segments[:-1]]
+
+    def objective_at(self, t):
+        """ The optimal value for the right hand side b + t*d, None if t is outside of the segments """
+        for s in self.segments:
+            if s["start"] <= t and (s["end"] is None or t <= s["end"]):
+                return s["objective"] + t*s["slope"]
+        return None
+
+    def solution_at(self, t):
+        """ An optimal solution for the right hand side b + t*d, None if t is outside of the segments """
+        for s in self.segments:
+            if s["start"] <= t and (s["end"] is None or t <= s["end"]):
+                return s["solution"] + t*s["slopeSolution"]
+        return None
+
+    # _____ Output fontions ______
+    def __str__(self):
+        if not self.segments:
+            return "For t = 0, this linear program is {0}".format(self.status.upper())
+        output_string = ""
+        for s in self.segments:
+            end = "+infinity" if s["end"] is None else frac_print(s["end"])
+            output_string += "For t in [{0}, {1}] : basis {2}, objective = {3} + t*({4})\n".format(
+                frac_print(s["start"]), end, s["basis"], frac_print(s["objective"]), frac_print(s["slope"]))
+        if self.status=="Infeasible":
+            output_string += "For t > {0}, this linear program is INFEASIBLE\n".format(frac_print(self.segments[-1]["end"]))
+        output_string += "The basis changes {0} times".format(len(self.breakpoints))
+        return output_string
+
+    def __repr__(self):
+        return self.__str__()
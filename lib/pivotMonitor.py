@@ -0,0 +1,71 @@
+from collections import deque
+import numpy as np
+from time import perf_counter
+
+# ========================== PivotMonitor Class ================================
+class PivotMonitor:
+    """
+    Watches the pivots of a resolution, to stop the simplex when it stalls or runs too long.
+    A pivot is degenerate when it does not change the objective value.
+    The simplex is stalling after 'stallingLimit' consecutive degenerate pivots,
+    and it is cycling when it comes back to a basis already visited since the objective last changed
+    (only the last 'window' of these bases are remembered, as hashes).
+    Contains the following datas :
+        - nbDegenerate : the number of degenerate pivots done
+        - stalled : True once stalling or cycling was detected. The driver then switches to an anti-cycling rule
+        - maxIterations, deadline : limits on the number of pivots and on the time (perf_counter), None for no limit
+    """
+
+    def __init__(self, stallingLimit=50, window=100, maxIterations=None, timeLimit=None):
+        self.stallingLimit = stallingLimit
+        self.maxIterations = maxIterations
+        self.deadline = None if timeLimit is None else perf_counter()+timeLimit
+        self.nbDegenerate = 0
+        self.nbConsecutive = 0 # degenerate pivots since the objective last changed
+        self.stalled = False
+        self.recentBases = deque(maxlen=window)
+        self.value = None
+
+    def start_phase(self, tab):
+        """ The objective function changes between two phases : the history is reset """
+        self.value = tab.get_value_of_solution()
+        self.nbConsecutive = 0
+        self.recentBases.clear()
+        self.recentBases.append(self.basis_key(tab))
+
+    def basis_key(self, tab):
+        """ Hash of the set of basic variables """
+        return hash(np.sort(tab.basisHead[1:]).tobytes())
+
+    def update(self, tab):
+        """
+        To call after each pivot. Returns "stalling" or "cycling" when the simplex
+        is detected to stall or cycle for the first time, None otherwise
+        """
+        value = tab.get_value_of_solution()
+        if abs(value-self.value) > tab.backend.feasibilityTolerance:
+            self.value = value
+            self.nbConsecutive = 0
+            self.recentBases.clear()
+            return None
+        self.nbDegenerate += 1
+        self.nbConsecutive += 1
+        if self.stalled:
+            return None
+        basis = self.basis_key(tab)
+        if basis in self.recentBases:
+            self.stalled = True
+            return "cycling"
+        self.recentBases.append(basis)
+        if self.nbConsecutive >= self.stallingLimit:
+            self.stalled = True
+            return "stalling"
+        return None
+
+    def limit_reached(self, tab):
+        """ "IterationLimit" or "TimeLimit" if one of the limits is reached, None otherwise """
+        if self.maxIterations is not None and tab.nbPivot >= self.maxIterations:
+            return "IterationLimit"
+        if self.deadline is not None and perf_counter() >= self.deadline:
+            return "TimeLimit"
+        return None
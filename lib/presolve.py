@@ -0,0 +1,189 @@
+from fractions import *
+from numbers import Rational
+import numpy as np
+from .utilities import *
+from .sparseMatrix import SparseMatrix
+from .linearProgram import LinearProgram
+
+def divide(x, y):
+    """ x/y, exactly if both are rationals """
+    if isinstance(x, Rational) and isinstance(y, Rational):
+        return Fraction(x)/y
+    return x/y
+
+# ============================ Presolve Class ==================================
+class Presolve:
+    """
+    Reductions of a linear program before its tableau is built :
+        - empty rows : removed, or proof of infeasibility if their right hand side is negative
+        - zero columns : the variable is fixed to 0 if its cost is not positive
+        - singleton rows a*x_j <= b : turned into a bound on x_j.
+          A lower bound l>0 is removed by the substitution x_j = l + x'_j,
+          and x_j <= 0 fixes x_j to 0
+        - duplicate rows : among the positive multiples of a row, only the tightest is kept
+    The reductions are repeated until none applies.
+    Contains the following datas :
+        - status : None, or "Infeasible" / "Unbounded" / "Optimal" if the presolve alone solved the LP.
+          It is "Optimal" when every row and column was removed : postsolve then gives the fixed values
+        - reducedLP : the reduced linear program, to be solved instead of the original one
+        - log : one line per kind of reduction, with its number of occurrences
+    """
+
+    def __init__(self, lp, verboseMode=False):
+        self.lp = lp
+        self.verboseMode = verboseMode
+        self.status = None
+        self.counts = dict()
+        self.reducedLP = None
+
+        if lp.is_sparse():
+            self.rows = [dict(row) for row in lp.constraintMatrix.rows]
+        else:
+            self.rows = [{j:x for j,x in enumerate(line.tolist()) if x!=0} for line in lp.constraintMatrix]
+        self.b = np.asarray(lp.constraintVector).tolist()
+        self.c = np.asarray(lp.objectiveFunction).tolist()
+        self.activeRows = set(range(lp.nbConst))
+        self.activeCols = set(range(lp.nbVar))
+        self.shift = [0]*lp.nbVar # x_j = shift[j] + (the variable of the reduced LP)
+        self.offset = 0 # constant term of the objective function
+
+        changed = True
+        while changed and self.status is None:
+            changed = self.remove_empty_rows() | self.remove_singleton_rows() | self.remove_zero_columns() | self.remove_duplicate_rows()
+        if self.status is None:
+            if not self.activeRows and self.activeCols:
+                self.status = "Unbounded" # no constraint left, and the remaining variables have a positive cost
+            elif not self.activeRows:
+                self.status = "Optimal" # every variable is fixed
+                self.colIndices = []
+            else:
+                self.build_reduced_lp()
+
+    # _____ Reductions ______
+    def record(self, reduction, message):
+        self.counts[reduction] = self.counts.get(reduction, 0)+1
+        if self.verboseMode:
+            print("Presolve : "+message)
+
+    @property
+    def log(self):
+        return ["{0} {1}".format(n, reduction) for reduction,n in self.counts.items()]
+
+    def remove_row(self, i):
+        self.activeRows.discard(i)
+
+    def remove_column(self, j):
+        """ x_j is fixed to its shift """
+        self.activeCols.discard(j)
+        for i in self.activeRows:
+            self.rows[i].pop(j, None)
+
+    def remove_empty_rows(self):
+        changed = False
+        for i in sorted(self.activeRows):
+            if not self.rows[i]:
+                if self.b[i]<0:
+                    self.status = "Infeasible"
+                    if self.verboseMode:
+                        print("Presolve : constraint {0} reads 0 <= {1}. The LP is infeasible".format(i+1, frac_print(self.b[i])))
+                    return False
+                self.remove_row(i)
+                self.record("empty rows removed", "constraint {0} is empty".format(i+1))
+                changed = True
+        return changed
+
+    def remove_zero_columns(self):
+        used = set()
+        for i in self.activeRows:
+            used.update(self.rows[i].keys())
+        changed = False
+        for j in sorted(self.activeCols - used):
+            if self.c[j]<=0:
+                self.remove_column(j)
+                self.record("zero columns removed", "x_{0} appears in no constraint, it is fixed to {1}".format(j+1, frac_print(self.shift[j])))
+                changed = True
+        return changed
+
+    def remove_singleton_rows(self):
+        changed = False
+        for i in sorted(self.activeRows):
+            if i not in self.activeRows or len(self.rows[i])!=1:
+                continue
+            (j,a), = self.rows[i].items()
+            b = self.b[i]
+            if a>0 and b<0:
+                self.status = "Infeasible"
+                if self.verboseMode:
+                    print("Presolve : constraint {0} gives x_{1} < 0. The LP is infeasible".format(i+1, j+1))
+                return False
+            if a>0 and b==0: # x_j <= 0 : x_j is fixed
+                self.remove_row(i)
+                self.remove_column(j)
+                self.record("variables fixed by bounds", "constraint {0} fixes x_{1} to {2}".format(i+1, j+1, frac_print(self.shift[j])))
+                changed = True
+            elif a<0: # lower bound x_j >= b/a
+                self.remove_row(i)
+                if b<0:
+                    self.shift_column(j, divide(b,a))
+                    self.record("lower bounds substituted", "constraint {0} gives x_{1} >= {2}".format(i+1, j+1, frac_print(divide(b,a))))
+                else:
+                    self.record("redundant singleton rows removed", "constraint {0} gives x_{1} >= {2}".format(i+1, j+1, frac_print(divide(b,a))))
+                changed = True
+        return changed
+
+    def shift_column(self, j, l):
+        """ Substitution x_j = l + x'_j """
+        self.shift[j] += l
+        self.offset += self.c[j]*l
+        for i in self.activeRows:
+            if j in self.rows[i]:
+                self.b[i] -= self.rows[i][j]*l
+
+    def remove_duplicate_rows(self):
+        kept = dict() # normalized row -> index of the tightest row
+        changed = False
+        for i in sorted(self.activeRows):
+            row = self.rows[i]
+            if not row: # left to remove_empty_rows
+                continue
+            s = abs(row[min(row)])
+            key = tuple(sorted((j,divide(x,s)) for j,x in row.items()))
+            k = kept.get(key)
+            if k is None:
+                kept[key] = i
+                continue
+            if divide(self.b[i],s) < divide(self.b[k],abs(self.rows[k][min(row)])):
+                kept[key] = i
+                i,k = k,i
+            self.remove_row(i)
+            self.record("duplicate rows removed", "constraint {0} is a multiple of constraint {1}".format(i+1, k+1))
+            changed = True
+        return changed
+
+    # _____ Reduced LP ______
+    def build_reduced_lp(self):
+        self.rowIndices = sorted(self.activeRows)
+        self.colIndices = sorted(self.activeCols)
+        c = np.array([self.c[j] for j in self.colIndices])
+        b = np.array([self.b[i] for i in self.rowIndices])
+        if self.lp.is_sparse():
+            position = {j:p for p,j in enumerate(self.colIndices)}
+            rows = [{position[j]:x for j,x in self.rows[i].items()} for i in self.rowIndices]
+            A = SparseMatrix(len(self.rowIndices), len(self.colIndices), rows)
+        else:
+            A = np.asarray(self.lp.constraintMatrix)[np.ix_(self.rowIndices, self.colIndices)]
+        self.reducedLP = LinearProgram.from_arrays(c, b, A)
+
+    def postsolve(self, result):
+        """
+        Maps the SolveResult of the reduced LP back to the variables of the original LP.
+        The basis of the reduced LP has no meaning for the original LP, so it is dropped.
+        """
+        result.basis = None
+        if result.is_optimal():
+            values = list(self.shift)
+            for p,j in enumerate(self.colIndices):
+                values[j] = values[j] + result.solution[p]
+            result.solution = np.array(values, dtype=object)
+            result.objective = result.objective + self.offset
+        return result
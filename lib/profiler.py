@@ -0,0 +1,33 @@
+from time import perf_counter
+
+# ============================ Profiler Class ==================================
+class Profiler:
+    """
+    Counters and timings of the operations of the simplex (choice of the entering
+    and leaving variables, pivots...), accumulated over the iterations.
+    record(name, start) adds the time elapsed since 'start' to the operation 'name'
+    and returns the current time, so that consecutive operations share a single clock.
+    """
+
+    def __init__(self):
+        self.counts = dict()
+        self.times = dict()
+
+    def record(self, name, start):
+        now = perf_counter()
+        self.counts[name] = self.counts.get(name, 0)+1
+        self.times[name] = self.times.get(name, 0)+now-start
+        return now
+
+    def to_dict(self):
+        return {name: {"count": self.counts[name], "time": self.times[name]} for name in self.counts}
+
+    def __str__(self):
+        output_string = "Time spent in each operation :\n"
+        for name in self.counts:
+            output_string += "    {0:12} {1:>8} calls {2:10.4f} s   {3:10.4f} ms per call\n".format(
+                name, self.counts[name], self.times[name], 1000*self.times[name]/self.counts[name])
+        return output_string
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,230 @@
+import numpy as np
+from fractions import *
+from .utilities import *
+from .tableau import Tableau
+from .backend import ExactBackend
+
+# ========================= Basis factorization ================================
+class BasisFactorization:
+    """
+    Factorization of the basis matrix B of the revised simplex.
+    B is first decomposed as P*B = L*U (LU with partial pivoting).
+    Each pivot then appends an elementary "eta" matrix E to the eta file,
+    such that the inverse of the new basis is E times the inverse of the previous one.
+    """
+
+    def __init__(self, B, backend):
+        self.backend = backend
+        self.size = B.shape[0]
+        self.etas = [] # eta file : list of (row of the pivot, entering column)
+
+        m = self.size
+        self.U = B.copy()
+        self.L = backend.zeros((m,m)) # strictly lower part of L. The diagonal is implicitly 1
+        self.perm = np.arange(m)
+        for k in range(m):
+            p = k + np.argmax(np.abs(self.U[k:,k]))
+            if abs(self.U[p,k]) <= backend.pivotTolerance:
+                raise ValueError("The basis matrix is singular")
+            if p != k:
+                self.U[[k,p]] = self.U[[p,k]]
+                self.L[[k,p]] = self.L[[p,k]]
+                self.perm[[k,p]] = self.perm[[p,k]]
+            f = self.U[k+1:,k]/self.U[k,k]
+            self.L[k+1:,k] = f
+            self.U[k+1:,k:] -= np.outer(f, self.U[k,k:])
+
+    def ftran(self, v):
+        """ Solves B*x = v. v can also be a matrix, whose columns are solved at once """
+        x = v[self.perm].copy()
+        for i in range(1,self.size): # L is unit lower triangular
+            x[i] -= np.dot(self.L[i,:i], x[:i])
+        for i in range(self.size-1,-1,-1):
+            x[i] = (x[i] - np.dot(self.U[i,i+1:], x[i+1:]))/self.U[i,i]
+        for r,alpha in self.etas:
+            x[r] /= alpha[r]
+            xr = x[r].copy() if x.ndim>1 else x[r]
+            x -= np.multiply.outer(alpha, xr)
+            x[r] = xr
+        return x
+
+    def btran(self, c):
+        """ Solves transpose(y)*B = transpose(c) """
+        c = c.copy()
+        for r,alpha in reversed(self.etas):
+            c[r] = (c[r] - (np.dot(c, alpha) - c[r]*alpha[r]))/alpha[r]
+        s = c
+        for i in range(self.size): # transpose(U) is lower triangular
+            s[i] = (s[i] - np.dot(self.U[:i,i], s[:i]))/self.U[i,i]
+        for i in range(self.size-2,-1,-1): # transpose(L) is unit upper triangular
+            s[i] -= np.dot(self.L[i+1:,i], s[i+1:])
+        y = s.copy()
+        y[self.perm] = s
+        return y
+
+    def update(self, alpha, r):
+        """
+        Pivot on row r. alpha is the entering column, expressed in the current basis
+        (that is alpha = B^-1 * a)
+        """
+        self.etas.append((r, alpha.copy()))
+
+
+# ========================== RevisedTableau Class ==============================
+class RevisedTableau(Tableau):
+    """
+    Implementation of the revised simplex method.
+    Instead of pivoting on the whole tableau, only a factorization of the basis
+    is kept. The rows and columns of the tableau are computed on demand.
+    The basis is refactorized from scratch every 'refactorFrequency' pivots.
+    """
+    __slots__ = ("refactorFrequency", "matrix", "rhs", "cost", "excludedColumns", "factorization",
+                 "reducedCosts", "dualValues", "rhsColumn", "lastColumn")
+
+    def __init__(self, lp, backend=None, artificial=True, refactorFrequency=50):
+        """
+        Builds the standard form of the linear program 'lp',
+        with the same slack and artificial variables as the full tableau
+        """
+        self.nbPivot = 0 # Counter for output
+        self.backend = backend if backend is not None else ExactBackend()
+        self.refactorFrequency = refactorFrequency
+
+        artificialConstRows = self.init_basis(lp, artificial)
+        artificialRows = set(artificialConstRows)
+        m = lp.nbConst
+
+        # standard form matrix : one column per variable. The right hand side is kept apart
+        self.matrix = self.backend.zeros((m, self.width-1))
+        self.matrix[:,0:lp.nbVar] = self.backend.convert(lp.get_dense_matrix())
+        self.rhs = self.backend.convert(lp.constraintVector)
+        for i in range(m):
+            self.matrix[i,lp.nbVar+i] = Fraction(1,1) # slack variable
+            if i+1 in artificialRows:
+                self.matrix[i] *= -1 # we want only >0 numbers in the right hand side
+                self.rhs[i] *= -1
+        for k,line in enumerate(artificialConstRows):
+            self.matrix[line-1,lp.nbVar+lp.nbConst+k] = Fraction(1,1)
+
+        # cost of each variable for the current phase
+        self.cost = self.backend.zeros(self.width-1)
+        if not artificialConstRows:
+            self.cost[0:lp.nbVar] = self.backend.convert(lp.objectiveFunction)
+        else:
+            self.cost[lp.nbVar+lp.nbConst:] = Fraction(-1,1)
+        self.excludedColumns = [] # artificial columns, once phase 1 is over
+
+        self.refactor()
+
+    def basis_columns(self):
+        """ Index of the column of the basic variable of each constraint """
+        return self.basisHead[1:]-1
+
+    def refactor(self):
+        """ Computes a fresh factorization of the current basis """
+        self.factorization = BasisFactorization(self.matrix[:,self.basis_columns()], self.backend)
+        self.clear_cache()
+
+    def clear_cache(self):
+        self.reducedCosts = None
+        self.dualValues = None
+        self.rhsColumn = None
+        self.lastColumn = None # (variable, column) of the last column computed
+
+    def set_basis(self, basis):
+        Tableau.set_basis(self, basis)
+        self.refactor() # drops the eta file of the pivots
+
+    def get_dual_values(self):
+        """ y = c_B B^-1, computed once per basis """
+        if self.dualValues is None:
+            self.dualValues = self.factorization.btran(self.cost[self.basis_columns()])
+        return self.dualValues
+
+    def get_reduced_costs(self):
+        if self.reducedCosts is None:
+            basis = self.basis_columns()
+            d = self.cost - np.dot(self.get_dual_values(), self.matrix)
+            d[basis] = Fraction(0,1)
+            d[self.excludedColumns] = Fraction(0,1)
+            self.reducedCosts = d
+        return self.reducedCosts
+
+    def get_reduced_costs_of(self, cols):
+        """ Prices the columns 'cols' only, unless all the reduced costs are already known """
+        if self.reducedCosts is not None:
+            return self.reducedCosts[cols]
+        basis = self.basis_columns()
+        d = self.cost[cols] - np.dot(self.get_dual_values(), self.matrix[:,cols])
+        d[np.isin(cols, basis) | np.isin(cols, self.excludedColumns)] = Fraction(0,1)
+        return d
+
+    def get_column(self, x):
+        if self.lastColumn is None or self.lastColumn[0]!=x:
+            col = self.backend.zeros(self.height)
+            col[0] = self.get_reduced_costs_of(np.array([x-1]))[0]
+            col[1:] = self.factorization.ftran(self.matrix[:,x-1])
+            self.lastColumn = (x, col)
+        return self.lastColumn[1]
+
+    def get_rhs(self):
+        if self.rhsColumn is None:
+            xB = self.factorization.ftran(self.rhs)
+            col = self.backend.zeros(self.height)
+            col[0] = -np.dot(self.cost[self.basis_columns()], xB)
+            col[1:] = xB
+            self.rhsColumn = col
+        return self.rhsColumn
+
+    def get_row(self, i):
+        """ Row i of the tableau (i>=1), without the right hand side """
+        e = self.backend.zeros(self.height-1)
+        e[i-1] = Fraction(1,1)
+        return np.dot(self.factorization.btran(e), self.matrix)
+
+    def column_dots(self, col, cols):
+        y = self.factorization.btran(col[1:])
+        return col[0]*self.get_reduced_costs()[cols] + np.dot(y, self.matrix[:,cols])
+
+    def compute_column_norms(self):
+        return np.array([np.dot(col, col) for col in (self.get_column(x) for x in range(1,self.width))])
+
+    def to_array(self):
+        data = self.backend.zeros((self.height, self.width))
+        data[0,0:-1] = self.get_reduced_costs()
+        for j in range(self.width-1):
+            data[1:,j] = self.factorization.ftran(self.matrix[:,j])
+        data[:,-1] = self.get_rhs()
+        return data
+
+    def do_pivot(self, enteringVar, leavingVar):
+        """
+        Apply the pivot.
+        enteringVar -> the variable that will replace leavingVar in the basis.
+        Only the eta file of the factorization is updated.
+        """
+        self.update_pricing(enteringVar, leavingVar)
+        alpha = self.get_column(enteringVar)[1:]
+        leavingInd = self.update_basis(enteringVar, leavingVar)
+        self.factorization.update(alpha, leavingInd-1)
+        if len(self.factorization.etas) >= self.refactorFrequency:
+            self.refactor()
+        else:
+            self.clear_cache()
+
+    def remove_artificial_variables(self):
+        """
+        Removes the artificial variables from the basis. Their columns are dropped at once if none of them is basic,
+        otherwise the removed ones are excluded from the pricing
+        """
+        removed = self.remove_artificial_from_basis()
+        if self.width-1 < self.matrix.shape[1]:
+            self.matrix = self.matrix[:,0:self.width-1].copy()
+            self.excludedColumns = []
+        else:
+            self.excludedColumns = removed
+
+    def set_objective(self, objfunc):
+        self.cost = self.backend.zeros(self.width-1)
+        self.cost[0:len(objfunc)] = self.backend.convert(objfunc)
+        self.clear_cache()
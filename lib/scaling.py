@@ -0,0 +1,96 @@
+from fractions import *
+import numpy as np
+from .utilities import *
+from .sparseMatrix import SparseMatrix
+from .linearProgram import LinearProgram
+
+scalingMethods = {"Geometric", "Equilibration"}
+
+# ============================ Scaling Class ===================================
+class Scaling:
+    """
+    Row and column scaling of a linear program : A' = R*A*C, b' = R*b, c' = C*c,
+    where R and C are diagonal. A solution x' of the scaled LP gives the solution x = C*x'
+    of the original LP, with the same objective value.
+    Methods :
+        - Geometric : each row, then each column, is divided by the geometric mean
+          of its largest and smallest entries (in absolute value). Repeated 'passes' times
+        - Equilibration : the largest entry of each row, then of each column, becomes 1
+    The factors are rounded to powers of 2, so that the scaling adds no rounding error
+    with floats, and only powers of 2 in the denominators with fractions.
+    Contains the following datas :
+        - rowFactors, colFactors : the diagonals of R and C
+        - scaledLP : the scaled linear program
+        - rangeBefore, rangeAfter : log2 of the ratio between the largest and the smallest
+          nonzero coefficients of the constraint matrix, before and after scaling
+    """
+
+    def __init__(self, lp, method="Geometric", exact=True, passes=4):
+        if method not in scalingMethods:
+            raise ValueError("Unknown scaling method : {0}".format(method))
+        self.method = method
+        self.exact = exact
+        rowInd, colInd, logs = self.log_coefficients(lp)
+        r = np.zeros(lp.nbConst)
+        s = np.zeros(lp.nbVar)
+        for k in range(passes if method=="Geometric" else 1):
+            r = r - self.row_measure(rowInd, logs + r[rowInd] + s[colInd], lp.nbConst)
+            s = s - self.row_measure(colInd, logs + r[rowInd] + s[colInd], lp.nbVar)
+        r, s = np.round(r).astype(int), np.round(s).astype(int)
+        self.rangeBefore = np.ptp(logs) if len(logs) else 0
+        self.rangeAfter = np.ptp(logs + r[rowInd] + s[colInd]) if len(logs) else 0
+
+        self.rowFactors = self.powers_of_2(r)
+        self.colFactors = self.powers_of_2(s)
+        c = self.convert(lp.objectiveFunction)*self.colFactors
+        b = self.convert(lp.constraintVector)*self.rowFactors
+        if lp.is_sparse():
+            rows = [{j:x*self.rowFactors[i]*self.colFactors[j] for j,x in row.items()} for i,row in enumerate(lp.constraintMatrix.rows)]
+            A = SparseMatrix(lp.nbConst, lp.nbVar, rows)
+        else:
+            A = self.convert(lp.constraintMatrix)*np.outer(self.rowFactors, self.colFactors)
+        self.scaledLP = LinearProgram.from_arrays(c, b, A)
+
+    def log_coefficients(self, lp):
+        """ Row indices, column indices and log2 of the absolute values of the nonzero coefficients """
+        if lp.is_sparse():
+            entries = [(i,j,x) for i,row in enumerate(lp.constraintMatrix.rows) for j,x in row.items()]
+            rowInd = np.array([e[0] for e in entries], dtype=int)
+            colInd = np.array([e[1] for e in entries], dtype=int)
+            values = np.array([abs(float(e[2])) for e in entries], dtype=float)
+        else:
+            A = np.asarray(lp.constraintMatrix)
+            rowInd, colInd = np.nonzero(A)
+            values = np.abs(A[rowInd, colInd]).astype(float)
+        return rowInd, colInd, np.log2(values)
+
+    def row_measure(self, ind, logs, n):
+        """ For each of the n lines given by 'ind' : log2 of the value its entries are divided by """
+        largest = np.full(n, -np.inf)
+        np.maximum.at(largest, ind, logs)
+        nonEmpty = np.isfinite(largest) # empty lines are not scaled
+        measure = np.zeros(n)
+        if self.method=="Equilibration":
+            measure[nonEmpty] = largest[nonEmpty]
+        else:
+            smallest = np.full(n, np.inf)
+            np.minimum.at(smallest, ind, logs)
+            measure[nonEmpty] = (largest[nonEmpty]+smallest[nonEmpty])/2
+        return measure
+
+    def powers_of_2(self, exponents):
+        if self.exact:
+            return np.array([Fraction(2)**int(k) for k in exponents], dtype=object)
+        return np.exp2(exponents.astype(float))
+
+    def convert(self, values):
+        values = np.asarray(values)
+        if self.exact:
+            return values.astype(object)
+        return values.astype(np.float64)
+
+    def unscale(self, result):
+        """ Maps the SolveResult of the scaled LP back to the variables of the original LP """
+        if result.is_optimal():
+            result.solution = result.solution*self.colFactors
+        return result
@@ -0,0 +1,236 @@
+import hashlib
+import os
+import pickle
+import numpy as np
+from fractions import Fraction
+from .utilities import *
+
+# ======================== Fingerprint Class ===================================
+class Fingerprint:
+    """
+    Canonical form of a linear program, which does not depend on the order of its rows and columns.
+    The rows and the columns are labelled by color refinement, starting from b and c : the label of a column
+    is given by the labels of the rows where it has a nonzero and by these coefficients, and conversely,
+    until the labels stop splitting. The columns are then sorted by label, and the rows
+    by label, then by their entries in this column order.
+    Two LPs with the same fingerprint are the same LP up to a permutation of the rows and columns.
+    The converse only fails for LPs with rows or columns that the labels can not tell apart.
+    A second canonical form is computed from the constraint matrix only, starting from equal labels :
+    LPs which only differ by c or b share it, and the basis of one can warm start the other.
+    Contains the following datas :
+        - colOrder, rowOrder : column k (row k) of the canonical form is column colOrder[k] (row rowOrder[k]) of the LP
+        - key : hash of the dimensions, and of the canonical A, c and b
+        - structureColOrder, structureRowOrder : the same, for the canonical form of the constraint matrix only
+        - structureKey : hash of the dimensions and of the canonical constraint matrix
+    """
+
+    def __init__(self, lp):
+        self.nbVar = lp.nbVar
+        self.nbConst = lp.nbConst
+        matrix = lp.get_dense_matrix()
+        cost = lp.objectiveFunction
+        rhs = lp.constraintVector
+        self.rowOrder, self.colOrder = self.canonical_order(matrix, self.rank(list(rhs)), self.rank(list(cost)))
+        self.key = self.hash(matrix[self.rowOrder][:,self.colOrder], cost[self.colOrder], rhs[self.rowOrder])
+        self.structureRowOrder, self.structureColOrder = self.canonical_order(matrix, [0]*self.nbConst, [0]*self.nbVar)
+        self.structureKey = self.hash(matrix[self.structureRowOrder][:,self.structureColOrder])
+
+    @staticmethod
+    def rank(signatures):
+        """ Replaces each signature by its rank among the distinct signatures """
+        ranks = {sig:k for k,sig in enumerate(sorted(set(signatures)))}
+        return [ranks[sig] for sig in signatures]
+
+    def canonical_order(self, matrix, rowLabels, colLabels):
+        """ The orders of the rows and of the columns of the canonical form, starting from the given labels """
+        nonzeros = [np.flatnonzero(matrix[:,j]) for j in range(self.nbVar)]
+        nbLabels = len(set(rowLabels))+len(set(colLabels))
+        while True:
+            colLabels = self.rank([(colLabels[j], tuple(sorted((rowLabels[i], matrix[i,j]) for i in nonzeros[j])))
+                                   for j in range(self.nbVar)])
+            columns = [[] for i in range(self.nbConst)]
+            for j in range(self.nbVar):
+                for i in nonzeros[j]:
+                    columns[i].append((colLabels[j], matrix[i,j]))
+            rowLabels = self.rank([(rowLabels[i], tuple(sorted(columns[i]))) for i in range(self.nbConst)])
+            newNbLabels = len(set(rowLabels))+len(set(colLabels))
+            if newNbLabels==nbLabels:
+                break
+            nbLabels = newNbLabels
+        colOrder = sorted(range(self.nbVar), key=lambda j: colLabels[j])
+        rowOrder = sorted(range(self.nbConst), key=lambda i: (rowLabels[i], tuple(matrix[i,colOrder])))
+        return rowOrder, colOrder
+
+    def hash(self, matrix, *vectors):
+        """
+        The floats are hashed as the exact fractions they represent : two different floats never share a key,
+        and an integral float has the key of the equal fraction, so that float and exact LPs share their structure
+        """
+        digest = hashlib.sha256("{0} {1}\n".format(self.nbVar, self.nbConst).encode())
+        for line in list(matrix)+list(vectors):
+            digest.update((" ".join(frac_print(Fraction(x)) for x in line)+"\n").encode())
+        return digest.hexdigest()
+
+    # _____ Change of variables ______
+    def basis_to_canonical(self, basis, structure=False):
+        """
+        basis[i] is the basic variable of constraint i+1 : the rows and the variables
+        (x_1 ... x_n, then the slack variables) are both permuted. Artificial variables are kept as they are.
+        With 'structure', the canonical form of the constraint matrix only is used
+        """
+        rowOrder, colOrder = (self.structureRowOrder, self.structureColOrder) if structure else (self.rowOrder, self.colOrder)
+        colPosition, rowPosition = np.argsort(colOrder), np.argsort(rowOrder)
+        def to_canonical(x):
+            if 1 <= x <= self.nbVar:
+                return int(colPosition[x-1])+1
+            if x <= self.nbVar+self.nbConst:
+                return self.nbVar+int(rowPosition[x-self.nbVar-1])+1
+            return x
+        return [to_canonical(basis[i]) for i in rowOrder]
+
+    def basis_from_canonical(self, basis, structure=False):
+        rowOrder, colOrder = (self.structureRowOrder, self.structureColOrder) if structure else (self.rowOrder, self.colOrder)
+        def from_canonical(x):
+            if 1 <= x <= self.nbVar:
+                return colOrder[x-1]+1
+            if x <= self.nbVar+self.nbConst:
+                return self.nbVar+rowOrder[x-self.nbVar-1]+1
+            return x
+        return [from_canonical(basis[k]) for k in np.argsort(rowOrder)]
+
+    def solution_to_canonical(self, solution):
+        return solution[self.colOrder]
+
+    def solution_from_canonical(self, solution):
+        return solution[np.argsort(self.colOrder)]
+
+# ======================= SolutionCache Class ==================================
+class SolutionCache:
+    """
+    On-disk cache of the results of the simplex, shared by the runs (and the processes) using the same directory.
+    Each result is stored in canonical form under the key of the fingerprint of its LP,
+    so that an LP whose rows or columns were only reordered is found again.
+    The results are also keyed by the kind of solution : the numeric backend (a Float result is never
+    given to an Exact caller) and whether the solution is a vertex (interior point solutions without crossover are not).
+    The optimal basis of a vertex solution is also stored under the structure key : an LP which differs
+    only by c or b can be warm started from it.
+    The least recently used files are removed when the cache exceeds 'maxSize' bytes.
+    The size of the cache is measured once, then kept up to date by each store : the directory is only
+    scanned again when it crosses maxSize, and the eviction then goes down to lowWater*maxSize,
+    so that the next stores do not scan it again. The files written by other processes are only counted from this scan on.
+    """
+    lowWater = 0.9
+
+    def __init__(self, directory, maxSize=100*2**20):
+        self.directory = directory
+        self.maxSize = maxSize
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(size for mtime,size,path in self.scan())
+
+    def fingerprint(self, lp):
+        return Fingerprint(lp)
+
+    @staticmethod
+    def result_name(fingerprint, backend, vertex):
+        return "result_{0}_{1}_{2}".format(backend, "vertex" if vertex else "interior", fingerprint.key)
+
+    def get(self, fingerprint, backend="Exact", vertex=True):
+        """
+        The SolveResult cached for this LP, in the order of its rows and columns, computed with 'backend'
+        and being a vertex or not. None if it is not cached
+        """
+        result = self.load(self.result_name(fingerprint, backend, vertex))
+        if result is None:
+            return None
+        if result.solution is not None:
+            result.solution = fingerprint.solution_from_canonical(result.solution)
+        if result.basis is not None:
+            result.basis = fingerprint.basis_from_canonical(result.basis)
+        return result
+
+    def get_basis(self, fingerprint):
+        """ An optimal basis of an LP with the same constraint matrix, None if there is none """
+        basis = self.load("basis_"+fingerprint.structureKey)
+        if basis is None:
+            return None
+        return fingerprint.basis_from_canonical(basis, structure=True)
+
+    def put(self, fingerprint, result, backend="Exact", vertex=True):
+        """
+        Stores 'result', the SolveResult of the LP of 'fingerprint' computed with 'backend',
+        and its basis if it is an optimal vertex (the presolve drops it)
+        """
+        stored = pickle.loads(pickle.dumps(result)) # the result given back to the caller is not modified
+        if stored.solution is not None:
+            stored.solution = fingerprint.solution_to_canonical(stored.solution)
+        if stored.basis is not None:
+            stored.basis = fingerprint.basis_to_canonical(stored.basis)
+        self.store(self.result_name(fingerprint, backend, vertex), stored)
+        if vertex and result.is_optimal() and result.basis is not None:
+            self.store("basis_"+fingerprint.structureKey, fingerprint.basis_to_canonical(result.basis, structure=True))
+        self.evict()
+
+    # _____ Files ______
+    def path(self, name):
+        return os.path.join(self.directory, name+".pkl")
+
+    def load(self, name):
+        """ The object of the file 'name', None if it does not exist. Its access time is updated """
+        try:
+            with open(self.path(name), 'rb') as f:
+                obj = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError): # missing, evicted by another process, or truncated
+            return None
+        try:
+            os.utime(self.path(name)) # least recently used order
+        except OSError: # read only cache, or evicted in between
+            pass
+        return obj
+
+    def store(self, name, obj):
+        """ Writes a temporary file first : other processes never read half written files """
+        temp = self.path(name)+".{0}.tmp".format(os.getpid())
+        with open(temp, 'wb') as f:
+            pickle.dump(obj, f)
+        try:
+            self.size -= os.path.getsize(self.path(name)) # the file is replaced
+        except OSError:
+            pass
+        self.size += os.path.getsize(temp)
+        os.replace(temp, self.path(name))
+
+    def scan(self):
+        """ (modification time, size, path) of each file of the cache """
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def evict(self):
+        """
+        Once the cache is larger than maxSize, removes the least recently used files
+        until it is smaller than lowWater*maxSize
+        """
+        if self.size <= self.maxSize:
+            return
+        files = self.scan()
+        self.size = sum(f[1] for f in files)
+        for mtime,fileSize,path in sorted(files):
+            if self.size <= self.lowWater*self.maxSize:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.size -= fileSize
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pkl"):
+                os.remove(entry.path)
+        self.size = 0
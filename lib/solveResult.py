@@ -0,0 +1,76 @@
+from .utilities import *
+
+# ========================= SolveResult Class ==================================
+class SolveResult:
+    """
+    Result of the resolution of a linear program.
+    Contains the following datas :
+        - status : "Optimal", "Infeasible", "Unbounded",
+          or "IterationLimit" / "TimeLimit" if the resolution was stopped by a limit
+        - objective : the value of the objective function at the solution (None if not optimal)
+        - solution : the values of the variables x_1 ... x_n (None if not optimal)
+        - basis : the final basis. basis[i] is the basic variable expressed by constraint i+1
+          It can be given back to simplex_solve to warm start the resolution of a modified LP
+        - nbPivot : the number of pivots done
+        - nbIterations : the number of iterations of the interior point method (0 if it was not used)
+        - nbDegenerate : the number of degenerate pivots, which did not change the objective value
+        - stalled : True if stalling or cycling was detected, and an anti-cycling rule was used
+        - timings : dict giving the time spent in each phase of the resolution, in seconds
+        - settings : dict describing how the LP was solved (pivot rule, engine, ...)
+        - presolveLog : the reductions done by the presolve (None if there was no presolve)
+    Nothing is formatted until the result is printed.
+    """
+
+    def __init__(self, status, objective=None, solution=None, basis=None, nbPivot=0, timings=None, settings=None):
+        self.status = status
+        self.objective = objective
+        self.solution = solution
+        self.basis = basis
+        self.nbPivot = nbPivot
+        self.timings = timings if timings is not None else dict()
+        self.settings = settings if settings is not None else dict()
+        self.nbIterations = 0
+        self.nbDegenerate = 0
+        self.stalled = False
+        self.presolveLog = None
+
+    def is_optimal(self):
+        return self.status=="Optimal"
+
+    def get_solution_variables(self):
+        """ Returns a string containing the variables and their values """
+        return ", ".join(["x_{0} = {1}".format(x+1, frac_print(v)) for x,v in enumerate(self.solution)])
+
+    # _____ Output fontions ______
+    def presolve_summary(self):
+        if self.presolveLog is None:
+            return ""
+        if not self.presolveLog:
+            return "The presolve did not reduce the LP\n"
+        return "The presolve did the following reductions : {0}\n".format(", ".join(self.presolveLog))
+
+    def __str__(self):
+        if self.status=="Infeasible":
+            return self.presolve_summary()+"This linear program in INFEASIBLE"
+        if self.status=="Unbounded":
+            return self.presolve_summary()+"This linear program is UNBOUNDED"
+        if self.status=="IterationLimit":
+            return self.presolve_summary()+"The iteration limit was reached after {0} pivots".format(self.nbPivot)
+        if self.status=="TimeLimit":
+            return self.presolve_summary()+"The time limit was reached after {0} pivots".format(self.nbPivot)
+        output_string = self.presolve_summary()
+        output_string += "An optimal solution is : {0}\n".format(self.get_solution_variables())
+        output_string += "The value of the objective for this solution is : {0}\n".format(frac_print(self.objective))
+        if self.nbIterations:
+            output_string += "The number of interior point iterations is : {0}\n".format(self.nbIterations)
+        output_string += "The number of pivots is : {0}\n".format(self.nbPivot)
+        output_string += "The number of degenerate pivots (which did not change the objective) : {0}\n".format(self.nbDegenerate)
+        if self.stalled:
+            output_string += "The simplex stalled, and switched to Bland's rule for the entering and leaving variables\n"
+        for name,value in self.settings.items():
+            output_string += "The {0} used : {1}\n".format(name, value)
+        output_string += "The calculation took {0:.3f} seconds".format(self.timings.get("total", 0))
+        return output_string
+
+    def __repr__(self):
+        return self.__str__()
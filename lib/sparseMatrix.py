@@ -0,0 +1,57 @@
+from fractions import *
+import numpy as np
+
+# ======================= SparseMatrix Class ===================================
+class SparseMatrix:
+    """
+    Sparse matrix stored as a list of rows.
+    Each row is a dict {column index : value} holding only the nonzero entries,
+    so the memory used scales with the number of nonzeros.
+    Supports the indexing used on dense matrices : M[i,j] and M[i,:]
+    """
+
+    def __init__(self, nbRows, nbCols, rows=None):
+        self.nbRows = nbRows
+        self.nbCols = nbCols
+        self.rows = rows if rows is not None else [dict() for i in range(nbRows)]
+
+    @classmethod
+    def from_dense(cls, array):
+        rows = [{j:x for j,x in enumerate(line) if x!=0} for line in array]
+        return cls(len(array), len(array[0]) if len(array) else 0, rows)
+
+    @property
+    def shape(self):
+        return (self.nbRows, self.nbCols)
+
+    @property
+    def nnz(self):
+        """ The number of nonzero entries """
+        return sum(len(row) for row in self.rows)
+
+    def toarray(self):
+        """ The dense version of the matrix, as an array of fractions """
+        array = np.full(self.shape, Fraction(0,1), dtype=object)
+        for i,row in enumerate(self.rows):
+            for j,x in row.items():
+                array[i,j] = x
+        return array
+
+    def __len__(self):
+        return self.nbRows
+
+    def __getitem__(self, key):
+        i,j = key
+        if isinstance(j, slice):
+            line = np.full(self.nbCols, Fraction(0,1), dtype=object)
+            for k,x in self.rows[i].items():
+                line[k] = x
+            return line[j]
+        return self.rows[i].get(j, Fraction(0,1))
+
+    def __setitem__(self, key, value):
+        i,j = key
+        if value!=0:
+            self.rows[i][j] = value
+        else:
+            self.rows[i].pop(j, None)
@@ -0,0 +1,187 @@
+import numpy as np
+from fractions import *
+from .utilities import *
+from .tableau import Tableau
+from .backend import ExactBackend
+
+# =========================== SparseTableau Class ==============================
+class SparseTableau(Tableau):
+    """
+    Implementation of the full tableau method, where the tableau is stored
+    sparsely : each row is a dict {column index : value} of its nonzero entries.
+    The right hand side column is kept apart as a dense array.
+    'columns' indexes the same entries by column : columns[j] is the set of the rows having a nonzero in column j.
+    A pivot only touches the rows having a nonzero entry in the entering column,
+    and in those rows, only the nonzero columns of the pivot row.
+    """
+    __slots__ = ("rows", "rhs", "columns")
+
+    def __init__(self, lp, backend=None, artificial=True):
+        """
+        Builds the initial sparse tableau of the linear program 'lp',
+        with the same slack and artificial variables as the dense tableau
+        """
+        self.nbPivot = 0 # Counter for output
+        self.backend = backend if backend is not None else ExactBackend()
+
+        artificialConstRows = self.init_basis(lp, artificial)
+        artificialRows = set(artificialConstRows)
+
+        self.rows = [dict() for i in range(self.height)]
+        self.rhs = self.backend.zeros(self.height)
+        one = self.backend.scalar(1)
+        artificalVarCount = 0
+        for i in range(1,self.height):
+            if lp.is_sparse():
+                line = lp.constraintMatrix.rows[i-1].items()
+            else:
+                line = enumerate(lp.constraintMatrix[i-1])
+            row = {j:self.backend.scalar(x) for j,x in line if x!=0}
+            row[lp.nbVar+i-1] = one # slack variable
+            self.rhs[i] = self.backend.scalar(lp.constraintVector[i-1])
+            if i in artificialRows: # one artificial variable is associated with this constraint
+                row = {j:-x for j,x in row.items()} # we want only >0 numbers in the right hand side
+                self.rhs[i] *= -1
+                row[lp.nbConst+lp.nbVar+artificalVarCount] = one
+                artificalVarCount +=1
+            self.rows[i] = row
+        self.columns = [set() for j in range(self.width-1)]
+        for i,row in enumerate(self.rows):
+            for j in row:
+                self.columns[j].add(i)
+        # top line
+        if not artificialConstRows:
+            self.set_row(0, {j:self.backend.scalar(x) for j,x in enumerate(lp.objectiveFunction) if x!=0})
+        else:
+            for line in artificialConstRows:
+                self.add_to_row(0, line, one)
+                self.rhs[0] += self.rhs[line]
+            for j in range(lp.nbVar+lp.nbConst, self.width-1):
+                self.rows[0].pop(j) # the -1 of the artificial variable cancels its coefficient
+                self.columns[j].discard(0)
+
+    def set_row(self, i, row):
+        """ Replaces row i by the dict 'row', and updates the column index """
+        for j in self.rows[i]:
+            self.columns[j].discard(i)
+        for j in row:
+            self.columns[j].add(i)
+        self.rows[i] = row
+
+    def add_to_row(self, i, k, f):
+        """ row i += f*row k, dropping the entries that become zero """
+        row = self.rows[i]
+        tolerance = self.backend.pivotTolerance
+        for j,x in self.rows[k].items():
+            if j in row:
+                y = row[j] + f*x
+                if abs(y) > tolerance:
+                    row[j] = y
+                else:
+                    del row[j]
+                    self.columns[j].discard(i)
+            else:
+                y = f*x
+                if abs(y) > tolerance:
+                    row[j] = y
+                    self.columns[j].add(i)
+
+    @property
+    def nnz(self):
+        """ The number of nonzero entries, the right hand side excepted """
+        return sum(len(row) for row in self.rows)
+
+    def get_reduced_costs(self):
+        costs = self.backend.zeros(self.width-1)
+        for j,x in self.rows[0].items():
+            costs[j] = x
+        return costs
+
+    def get_reduced_costs_of(self, cols):
+        top = self.rows[0]
+        costs = self.backend.zeros(len(cols))
+        for k,j in enumerate(cols):
+            costs[k] = top.get(j,0)
+        return costs
+
+    def get_column(self, x):
+        col = self.backend.zeros(self.height)
+        for i in self.columns[x-1]:
+            col[i] = self.rows[i][x-1]
+        return col
+
+    def get_rhs(self):
+        return self.rhs
+
+    def get_row(self, i):
+        row = self.backend.zeros(self.width-1)
+        for j,x in self.rows[i].items():
+            row[j] = x
+        return row
+
+    def column_dots(self, col, cols):
+        dots = self.backend.zeros(self.width-1)
+        for i in np.flatnonzero(col):
+            for j,x in self.rows[i].items():
+                dots[j] += col[i]*x
+        return dots[cols]
+
+    def compute_column_norms(self):
+        norms = self.backend.zeros(self.width-1)
+        for row in self.rows:
+            for j,x in row.items():
+                norms[j] += x*x
+        return norms
+
+    def to_array(self):
+        data = self.backend.zeros((self.height, self.width))
+        for i,row in enumerate(self.rows):
+            for j,x in row.items():
+                data[i,j] = x
+        data[:,-1] = self.rhs
+        return data
+
+    def do_pivot(self, enteringVar, leavingVar):
+        """
+        Apply the pivot.
+        enteringVar -> the variable that will replace leavingVar in the basis.
+        """
+        self.update_pricing(enteringVar, leavingVar)
+        leavingInd = self.update_basis(enteringVar, leavingVar)
+        q = enteringVar-1
+
+        # renormalize
+        p = self.rows[leavingInd][q]
+        self.rows[leavingInd] = {j:x/p for j,x in self.rows[leavingInd].items()}
+        self.rows[leavingInd][q] = self.backend.scalar(1)
+        self.rhs[leavingInd] /= p
+
+        for i in list(self.columns[q]): #apply pivot, to the rows having a nonzero in column q only
+            if i != leavingInd:
+                row = self.rows[i]
+                f = row[q]
+                self.add_to_row(i, leavingInd, -f)
+                row.pop(q, None) # exactly zero, whatever the rounding errors
+                self.rhs[i] -= f*self.rhs[leavingInd]
+        self.columns[q] = {leavingInd}
+
+    def remove_artificial_variables(self):
+        """ Removes the artificial variables from the basis, and their entries from the rows and from the column index """
+        removed = self.remove_artificial_from_basis()
+        for j in removed:
+            for i in self.columns[j]:
+                self.rows[i].pop(j)
+            self.columns[j] = set()
+        del self.columns[self.width-1:]
+
+    def set_objective(self, objfunc):
+        self.set_row(0, {j:self.backend.scalar(x) for j,x in enumerate(objfunc) if x!=0})
+        self.rhs[0] = self.backend.scalar(0)
+        for i in range(1,self.height):
+            x = self.basisHead[i]
+            if x-1 in self.rows[0]:
+                f = self.rows[0][x-1]
+                self.add_to_row(0, i, -f)
+                self.rows[0].pop(x-1, None)
+                self.columns[x-1].discard(0)
+                self.rhs[0] -= f*self.rhs[i]
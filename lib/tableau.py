@@ -1,6 +1,7 @@
 import numpy as np
 from fractions import *
 from .utilities import *
+from .backend import ExactBackend
 
 # ============================== Tableau Class =================================
 class Tableau:
@@ -8,73 +9,84 @@ class Tableau:
     Implementation of the full tableau method in the simplex algorithm.
     The tableau of a Linear Program is a concise way to represent its data.
     Simplex algorithm then do gaussian pivots on this tableau.
+    The basis is kept in two integer arrays :
+        - basisHead[i] : the basic variable expressed by constraint i (basisHead[0] is unused)
+        - basisPosition[x] : the constraint expressing x if x is basic, 0 if x is non basic,
+          and -1 if x was removed (artificial variables after phase 1, and the unused index 0)
     """
+    __slots__ = ("nbPivot", "backend", "data", "nbVar", "width", "height", "basisHead", "basisPosition",
+                 "artificialVariables", "columnNorms", "normsAge", "devexWeights", "pricingOffset", "pricingCandidates")
+    normsRefreshFrequency = 50 # float backend : pivots between two computations of the column norms from scratch
 
-    def __init__(self, lp):
+    def __init__(self, lp, backend=None, artificial=True):
         """
         Builds the initial tableau of the linear program 'lp'
         This implies tranforming the LP from canonic to standard from.
         This constructor also add artificial variables in order to run phase 1
         of the simplex when it is necessary
+        'backend' is the numeric backend storing the cells (exact by default)
+        If 'artificial' is False, no artificial variable is added : the slack basis
+        may then be infeasible (see set_basis and the dual simplex)
         """
         self.nbPivot = 0 # Counter for output
+        self.backend = backend if backend is not None else ExactBackend()
 
-        top_row = [Fraction(0,1)]*(lp.nbVar+lp.nbConst)
-        n = lp.nbVar+lp.nbConst+1 # will be the total number of columns in the tableau
-
-        self.nonBasicVariables = set()
-        self.basicVariables = set()
-        self.artificialVariables = set() # keep trace of artificialVariables
-        self.varAssocToConstraint = dict() # gives the basic variable expressed by constraint i
-        self.constraintAssocToVar = dict() # give the constraint that expresses variable x
-        artificialConstRows = []
-
-        for ind,x in enumerate(lp.constraintVector):
-            if x<0:
-                # we add an artificial variable to run phase 1
-                lp.need_2_phases = True # We will need two phases to run the simplex
-                top_row.append(-1)
-                self.artificialVariables.add(n)
-                self.basicVariables.add(n) # the artificial variable created is basic
-                self.varAssocToConstraint[ind+1]=n
-                self.constraintAssocToVar[n]=ind+1
-                artificialConstRows.append(ind+1)
-                n +=1
-            else:
-                slack_var = ind+lp.nbVar+1
-                self.varAssocToConstraint[ind+1]=slack_var
-                self.constraintAssocToVar[slack_var]=ind+1
-                self.basicVariables.add(slack_var) # the slack variable is basic
-
-        self.nonBasicVariables = set([x for x in range(1,n) if x not in self.basicVariables])
-        top_row.append(0) # initial value of the objective function
-
-        self.width = n # width of tableau = number of columns
-        self.height = lp.nbConst+1 # height of tableau = number of rows
+        artificialConstRows = self.init_basis(lp, artificial)
+        artificialRows = set(artificialConstRows)
 
-        self.data = np.array([Fraction(0,1)]*self.width*self.height).reshape((self.height, self.width))
-        self.data[0] = top_row
+        self.data = self.backend.zeros((self.height, self.width))
+        self.data[0,lp.nbVar+lp.nbConst:-1] = Fraction(-1,1) # artificial variables
 
+        self.data[1:,0:lp.nbVar] = self.backend.convert(lp.get_dense_matrix()) # constraint matrix
+        self.data[1:,-1] = self.backend.convert(lp.constraintVector)
         artificalVarCount = 0
-        for i in range(1,self.height): #constraint matrix
-            for j in range(lp.nbVar):
-                self.data[i,j] = lp.constraintMatrix[i-1,j]
-            self.data[i,j+i] = Fraction(1,1)
-            b = lp.constraintVector[i-1]
-            self.data[i,-1] = b
-            if b<0: # one artificial variable is associated with this constraint
+        for i in range(1,self.height):
+            self.data[i,lp.nbVar+i-1] = Fraction(1,1) # slack variable
+            if i in artificialRows: # one artificial variable is associated with this constraint
                 self.data[i] *= -1 # we want only >0 numbers in the right hand side
-                self.data[i,lp.nbConst+lp.nbVar+artificalVarCount] = 1
+                self.data[i,lp.nbConst+lp.nbVar+artificalVarCount] = Fraction(1,1)
                 artificalVarCount +=1
         # top line
-        if not lp.need_2_phases:
-            self.data[0] = np.concatenate([lp.objectiveFunction, np.array( [Fraction(0,1)]*(self.width-lp.nbVar))])
+        if not artificialConstRows:
+            self.data[0,0:lp.nbVar] = self.backend.convert(lp.objectiveFunction)
         else:
             for line in artificialConstRows:
                 self.data[0,:] += self.data[line,:]
 
+    def init_basis(self, lp, artificial=True):
+        """
+        Sets up the initial basis : one slack variable per constraint,
+        or one artificial variable when the right hand side is negative (and 'artificial' is True).
+        Also sets the dimensions of the tableau, and lp.need_2_phases.
+        Returns the list of the rows holding an artificial variable
+        """
+        n = lp.nbVar+lp.nbConst+1 # will be the total number of columns in the tableau
+        artificialConstRows = [ind+1 for ind,x in enumerate(lp.constraintVector) if x<0] if artificial else []
+        self.artificialVariables = set(range(n, n+len(artificialConstRows))) # keep trace of artificialVariables
+
+        # the slack variables are basic, except where an artificial variable is added to run phase 1
+        self.basisHead = np.arange(lp.nbVar, lp.nbVar+lp.nbConst+1, dtype=np.int64)
+        self.basisHead[0] = 0
+        self.basisHead[artificialConstRows] = np.arange(n, n+len(artificialConstRows))
+        n += len(artificialConstRows)
+        self.basisPosition = np.zeros(n, dtype=np.int64)
+        self.basisPosition[0] = -1
+        self.basisPosition[self.basisHead[1:]] = np.arange(1, lp.nbConst+1)
+        lp.need_2_phases = len(artificialConstRows)>0
+
+        self.columnNorms = None # pricing data of the steepest edge and devex rules, see get_column_norms
+        self.normsAge = 0 # number of updates of the column norms since they were computed
+        self.devexWeights = None
+        self.pricingOffset = 0 # first column of the next window of partial pricing
+        self.pricingCandidates = None # candidate list of multiple pricing
+
+        self.nbVar = lp.nbVar # number of variables of the LP. The slack variables come right after them
+        self.width = n # width of tableau = number of columns
+        self.height = lp.nbConst+1 # height of tableau = number of rows
+        return artificialConstRows
+
     def delete_column(self,i):
-        """ delete column i"""
+        """ delete column i. To remove several columns, a single np.delete is much cheaper """
         self.data = np.delete(self.data, i, axis=1)
         self.width -= 1
 
@@ -86,17 +98,23 @@ class Tableau:
     def transition_phaseI_phaseII(self, objfunc, verboseMode, debugMode):
         """
         Changes the utility function of the Tableau
-        and delete the artificial variables
+        and delete the artificial variables.
+        The engines only differ by how they store the tableau : see remove_artificial_variables and set_objective
         """
 
         # 1/ Check for remaining artifical variables in the basis
-        artificialBasicVariables = self.basicVariables & self.artificialVariables
+        artificialBasicVariables = self.get_artificial_basic()
         if (artificialBasicVariables):
             # additionnal pivots have to be done
             if verboseMode:
-                print("STILL ARTIFICIAL VARIABLE IN THE BASIS\nPivoting with slack variables to get rid of them...")
+                print("STILL ARTIFICIAL VARIABLE IN THE BASIS\nPivoting to get rid of them...")
             for x in artificialBasicVariables :
-                y = x-(self.height-2) # number of constraints -1
+                row = self.get_scaled_row(self.basisPosition[x])
+                candidates = [y for y in self.get_non_basic() if y not in self.artificialVariables
+                                and abs(row[y-1])>self.backend.pivotTolerance]
+                if not candidates:
+                    continue # redundant constraint : x stays in the basis with value 0
+                y = candidates[0]
                 if verboseMode:
                     print("The entering variable is x_{0}".format(y))
                     print("The leaving variable is x_{0} \n".format(x))
@@ -105,75 +123,259 @@ class Tableau:
                 if verboseMode:
                     print(self)
 
-        # 2/ Reload initial objective functions and apply pivots according to current basis
-        self.data[0] = np.concatenate([objfunc, np.array( [Fraction(0,1)]*(self.width-len(objfunc)))])
-        for x in self.basicVariables:
+        # 2/ Delete artificial variables
+        self.remove_artificial_variables()
+
+        # 3/ Reload initial objective functions and apply pivots according to current basis
+        self.set_objective(objfunc)
+        self.reset_pricing()
+
+    def set_objective(self, objfunc):
+        """ Replaces the top row by the reduced costs of 'objfunc' in the current basis """
+        self.data[0] = self.backend.zeros(self.width)
+        self.data[0,0:len(objfunc)] = self.backend.convert(objfunc)
+        for x in self.basisHead[1:]:
             if self.data[0,x-1]!=0:
-                i = np.argmax(self.data[1::,x-1])+1 #the line with the 1
+                i = self.basisPosition[x] #the line with the 1
                 self.data[0] -= self.data[i]*self.data[0,x-1]/self.data[i,x-1]
 
-        # 3/ Delete artificial variables
-        for x in range(len(self.artificialVariables)):
-            self.delete_column(self.width-2)
-        self.nonBasicVariables = self.nonBasicVariables - self.artificialVariables
-        self.artificialVariables = []
+    # _____ Basis ______
+    def get_artificial_basic(self):
+        """ The artificial variables which are still basic, in increasing order """
+        return sorted(int(x) for x in self.basisHead[1:] if x in self.artificialVariables)
+
+    def remove_artificial_from_basis(self):
+        """
+        Basis bookkeeping of the removal of the artificial variables, at the end of phase 1.
+        The non basic ones are removed, those still basic (redundant constraints) stay in the basis.
+        Returns the indices of the columns of the removed variables. When no artificial variable is basic,
+        they are the last columns of the tableau, and the width is reduced accordingly
+        """
+        first = self.nbVar+self.height # the first artificial variable
+        artificial = np.arange(first, self.width)
+        removed = artificial[self.basisPosition[first:]==0]
+        if len(removed)==len(artificial):
+            self.basisPosition = self.basisPosition[:first].copy()
+            self.width = first
+        else:
+            self.basisPosition[removed] = -1
+        self.artificialVariables = set()
+        return removed-1
+
+    def remove_artificial_variables(self):
+        """ Removes the artificial variables from the basis, and their columns from the tableau, all at once """
+        removed = self.remove_artificial_from_basis()
+        if self.width < self.data.shape[1]:
+            self.data = np.delete(self.data, removed, axis=1)
+        else:
+            self.data[:,removed] = 0
 
     def get_basic(self):
-        return self.basicVariables
+        """ The basic variables, in the order of the constraints """
+        return self.basisHead[1:]
 
     def print_basic(self):
         """ For outputing the final base """
-        return ", ".join(self.basicVariables)
+        return ", ".join(str(x) for x in self.basisHead[1:])
 
     def get_non_basic(self):
-        return self.nonBasicVariables
+        """ The non basic variables, in increasing order """
+        return np.flatnonzero(self.basisPosition==0)
 
     def get_value_of_solution(self):
         """ The current value of the function to maximize """
-        return -self.data[0,self.width-1]
+        return -self.get_rhs()[0]
+
+    def get_reduced_costs(self):
+        """ The top row of the tableau, without the right hand side """
+        return self.data[0,0:-1]
+
+    def get_reduced_costs_of(self, cols):
+        """ The reduced costs of the columns of indices 'cols' only (partial pricing) """
+        return self.data[0,cols]
+
+    def get_column(self, x):
+        """ The column of variable x, top row included """
+        return self.data[:,x-1]
+
+    def get_rhs(self):
+        """ The right hand side column, top row included """
+        return self.data[:,-1]
+
+    def get_row(self, i):
+        """ Row i of the tableau, without the right hand side """
+        return self.data[i,0:-1]
+
+    def column_dots(self, col, cols):
+        """ Dot products between 'col' and the columns of indices 'cols' """
+        return np.dot(col, self.data[:,cols])
+
+    # _____ Scaled getters ______
+    # The pricing and the ratio tests only compare values with 0 and ratios between them.
+    # These getters give the values multiplied by a positive factor (1 here), the same for the whole array :
+    # the signs, the order, and the order of the ratios of two arrays are kept.
+    # The Integer engine gives its integer cells, without building any Fraction.
+
+    def get_scaled_reduced_costs(self):
+        return self.get_reduced_costs()
+
+    def get_scaled_reduced_costs_of(self, cols):
+        return self.get_reduced_costs_of(cols)
+
+    def get_scaled_column(self, x):
+        """ The column of x : its constraint rows have the same factor as those of get_scaled_rhs, not its top row """
+        return self.get_column(x)
+
+    def get_scaled_rhs(self):
+        return self.get_rhs()
+
+    def get_scaled_row(self, i):
+        return self.get_row(i)
+
+    def ratios(self, num, den):
+        """ The exact quotients num/den of two arrays of scaled values """
+        return num/den
+
+    def to_array(self):
+        """ The explicit tableau, as an array """
+        return self.data
+
+    # _____ Pricing data ______
+    def get_column_norms(self):
+        """
+        Squared norms of the columns of the tableau (top row included), used by the steepest edge rule.
+        They are computed once, then updated at each pivot by update_pricing.
+        With floats, the rounding errors of the updates add up : the norms are computed again
+        every normsRefreshFrequency pivots, and as soon as one of them is not finite.
+        """
+        if self.columnNorms is None or (self.backend.dtype!=object and
+                (self.normsAge >= self.normsRefreshFrequency or not np.isfinite(self.columnNorms).all())):
+            self.columnNorms = self.compute_column_norms()
+            self.normsAge = 0
+        return self.columnNorms
+
+    def compute_column_norms(self):
+        data = self.data[:,0:-1]
+        return np.sum(data*data, axis=0)
+
+    def get_devex_weights(self):
+        """
+        Reference weights of the devex rule, an approximation of the squared column norms.
+        The reference framework is the set of non basic variables at the time of the first call.
+        """
+        if self.devexWeights is None:
+            self.devexWeights = np.ones(self.width-1)
+        return self.devexWeights
+
+    def reset_pricing(self):
+        """ Forgets the pricing data, when the top row or the columns of the tableau change """
+        self.columnNorms = None
+        self.devexWeights = None
+        self.pricingCandidates = None
+
+    def update_pricing(self, enteringVar, leavingVar):
+        """
+        Updates the column norms and the devex weights for the pivot (enteringVar, leavingVar).
+        Has to be called before the pivot is done.
+        Norms are updated with the Goldfarb-Reid recurrence : writing beta_j = a_rj/a_rq
+        for the pivot row r and the entering column q,
+            norm_j <- norm_j - 2*beta_j*(a_j.a_q) + beta_j^2*(norm_q+1)
+        Only the columns with a nonzero entry on the pivot row change.
+        """
+        if self.columnNorms is None and self.devexWeights is None:
+            return
+        q = enteringVar-1
+        row = self.get_row(self.basisPosition[leavingVar])
+        nz = np.flatnonzero(row)
+        beta = row[nz]/row[q]
+        if self.columnNorms is not None:
+            norms = self.columnNorms
+            dots = self.column_dots(self.get_column(enteringVar), nz)
+            norms[nz] = norms[nz] - 2*beta*dots + beta*beta*(norms[q]+1)
+            if self.backend.dtype!=object:
+                norms[nz] = np.maximum(norms[nz], beta*beta+1) # rounding errors : Goldfarb-Reid lower bound
+            self.normsAge += 1
+        if self.devexWeights is not None:
+            weights = self.devexWeights
+            wq = weights[q]
+            weights[nz] = np.maximum(weights[nz], beta.astype(float)**2*wq)
+            weights[leavingVar-1] = max(wq/float(row[q])**2, 1)
+
+    def set_basis(self, basis):
+        """
+        Pivots the variables of 'basis' into the basis, for instance the basis
+        of a previous SolveResult (warm start). Artificial variables, and variables
+        whose column depends on the columns already pivoted in, are skipped.
+        These pivots are not counted in nbPivot.
+        """
+        nbPivot = self.nbPivot
+        target = set(int(x) for x in basis if 0 < x < self.width and self.basisPosition[x]>=0 and x not in self.artificialVariables)
+        freeRows = [i for i in range(1,self.height) if self.basisHead[i] not in target]
+        for x in sorted(x for x in target if self.basisPosition[x]==0):
+            col = self.get_column(x)
+            rows = [i for i in freeRows if abs(col[i])>self.backend.pivotTolerance]
+            if not rows:
+                continue
+            i = max(rows, key=lambda i: abs(col[i])) # largest pivot
+            freeRows.remove(i)
+            self.do_pivot(x, self.basisHead[i])
+        self.nbPivot = nbPivot
+        self.reset_pricing()
+
+    def is_primal_feasible(self):
+        """ True if the right hand side is nonnegative : the current basic solution is feasible """
+        return bool(np.all(self.get_scaled_rhs()[1:] >= -self.backend.feasibilityTolerance))
+
+    def is_dual_feasible(self):
+        """ True if no reduced cost is positive : the current basis is optimal for the dual """
+        return bool(np.all(self.get_scaled_reduced_costs() <= self.backend.feasibilityTolerance))
+
+    def get_solution_vector(self, n):
+        """ Returns the values of the n first variables in the current tableau """
+        rhs = self.get_rhs()
+        values = self.backend.zeros(n)
+        # if basic, the variable equals the right hand side of the constraint in which it is expressed
+        position = self.basisPosition[1:n+1]
+        basic = np.flatnonzero(position>0)
+        values[basic] = rhs[position[basic]]
+        return values
 
     def get_solution_variables(self, n):
         """ Returns a string containing the value of the n first variables and their values in the current tableau"""
-        l = []
-        for x in range(1,n+1):
-            if x in self.basicVariables:
-                # if basic, the variable equals the right hand side of the constraint in which it is expressed
-                assocConstraint = self.constraintAssocToVar[x]
-                l.append("x_{0} = {1}".format(x, self.data[assocConstraint,-1]))
-            else:
-                l.append("x_{0} = 0".format(x))
-        return ", ".join(l)
+        values = self.get_solution_vector(n)
+        return ", ".join(["x_{0} = {1}".format(x+1, frac_print(values[x])) for x in range(n)])
 
     def do_pivot(self, enteringVar, leavingVar):
         """
         Apply the pivot.
         enteringVar -> the variable that will replace leavingVar in the basis.
         """
-        leavingInd = self.constraintAssocToVar[leavingVar]
-        self.nbPivot += 1
-        self.varAssocToConstraint[leavingInd]=enteringVar
-        self.constraintAssocToVar.pop(leavingVar, None)
-        self.constraintAssocToVar[enteringVar] = leavingInd
-
-        # update the basicVariables and nonBasicVariables lists
-        self.basicVariables.remove(leavingVar)
-        self.nonBasicVariables.add(leavingVar)
-        self.basicVariables.add(enteringVar)
-        self.nonBasicVariables.remove(enteringVar)
+        self.update_pricing(enteringVar, leavingVar)
+        leavingInd = self.update_basis(enteringVar, leavingVar)
 
         # do pivot on the matrix
-        self.data[leavingInd,:] /= self.data[leavingInd,enteringVar-1] # renormalize
-        for i in range(self.height): #apply pivot
-            if i != leavingInd:
-                self.data[i,:] -= self.data[leavingInd,:]*self.data[i,enteringVar-1]
+        self.backend.pivot(self.data, leavingInd, enteringVar-1)
+
+    def update_basis(self, enteringVar, leavingVar):
+        """
+        Basis bookkeeping of a pivot.
+        Returns the index of the row where the pivot happens
+        """
+        leavingInd = int(self.basisPosition[leavingVar])
+        self.nbPivot += 1
+        self.basisHead[leavingInd] = enteringVar
+        self.basisPosition[leavingVar] = 0
+        self.basisPosition[enteringVar] = leavingInd
+        return leavingInd
 
 
     def __str__(self):
+        data = self.to_array()
         # determine spacing between columns
         spacing=0
         for j in range(self.width):
             for i in range(self.height):
-                x = frac_print(self.data[i,j])
+                x = frac_print(data[i,j])
                 spacing = max(spacing, len(x)+2)
 
         output_string = ""
@@ -181,10 +383,10 @@ class Tableau:
         def print_row(i):
             row = ""
             for j in range(self.width-1):
-                x = frac_print(self.data[i,j])
+                x = frac_print(data[i,j])
                 row += x+" "*(spacing-len(x))
             row+= " |  "
-            row += frac_print(self.data[i,self.width-1])+"\n"
+            row += frac_print(data[i,self.width-1])+"\n"
             return row
 
         top_row = print_row(0) # top row
@@ -198,7 +400,7 @@ class Tableau:
         return self.__str__()
 
     def __getitem__(self, key):
-        return self.data[key]
+        return self.to_array()[key]
 
     def __setitem__(self, key, value):
         self.data[key] = value
@@ -1,18 +1,22 @@
 from fractions import *
+from numbers import Rational
 
 # ========== Utility function over fractions ===================================
 def convert(u):
     """
     u is a string representing a rationnal number (of general form [-]a[/b])
     Outputs the fraction object whose value is described in u
+    Decimal numbers (1.5, 1e-3) are also accepted
     """
     u = u.split("/")
-    if len(u)==1 : #integer
-        return Fraction(int(u[0]),1)
+    if len(u)==1 : #integer or decimal
+        return Fraction(u[0])
     else :
         return Fraction(int(u[0]), int(u[1]))
 
 def frac_print(u):
+    if not isinstance(u, Rational): # floating point value
+        return "{0:.12g}".format(u)
     if u.denominator == 1:
         return str(u.numerator)
     else :
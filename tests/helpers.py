@@ -0,0 +1,38 @@
+""" Scaffolding shared by the tests : import of the solver, and options restored after each test """
+
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import coiffier_simplex as simplex
+from lib import *
+
+INPUTS = os.path.join(ROOT, "inputs")
+
+class SimplexTestCase(unittest.TestCase):
+    """
+    The options of coiffier_simplex named in 'options' are saved before each test and restored after it,
+    so that a test can set them freely. Verbose mode is turned off.
+    """
+    options = ()
+
+    def setUp(self):
+        self.saved = {name: getattr(simplex, name) for name in set(self.options) | {"verboseMode"}}
+        simplex.verboseMode = False
+
+    def tearDown(self):
+        for name,value in self.saved.items():
+            setattr(simplex, name, value)
+
+    def solve_text(self, text, exact=True):
+        """ Solves the LP given in the text format of the input files """
+        with tempfile.NamedTemporaryFile('w', suffix=".in", delete=False) as f:
+            f.write(text)
+        try:
+            return simplex.simplex_solve(LinearProgram(f.name, exact=exact))
+        finally:
+            os.remove(f.name)
@@ -0,0 +1,33 @@
+""" Once the simplex stalls, Bland's rule must bring it to the optimum from whatever basis it reached """
+
+import unittest
+import numpy as np
+
+from helpers import *
+
+def degenerate_lp(rng, n, m):
+    """ Text of a small LP whose right hand side has many zeros """
+    A = rng.integers(-3, 4, (m, n))
+    b = rng.integers(0, 3, m) * (rng.random(m) < 0.3)
+    c = rng.integers(-2, 4, n)
+    lines = [str(n), str(m), " ".join(map(str, c)), " ".join(map(str, b))]
+    lines += [" ".join(map(str, row)) for row in A]
+    return "\n".join(lines)+"\n"
+
+class AntiCyclingTest(SimplexTestCase):
+    options = ("rule", "ratioTest", "stallingLimit", "maxIterations")
+
+    def test_degenerate_lps(self):
+        rng = np.random.default_rng(3)
+        simplex.maxIterations = 1000 # only there to stop the test if the simplex cycles
+        for k in range(200):
+            text = degenerate_lp(rng, 5, 6)
+            simplex.rule, simplex.ratioTest, simplex.stallingLimit = "Bland", "Bland", 50
+            expected = self.solve_text(text)
+            simplex.rule, simplex.ratioTest, simplex.stallingLimit = "MaxCoeff", "Harris", 2
+            result = self.solve_text(text)
+            self.assertEqual(result.status, expected.status, k)
+            self.assertEqual(result.objective, expected.objective, k)
+
+if __name__ == '__main__':
+    unittest.main()
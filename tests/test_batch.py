@@ -0,0 +1,57 @@
+""" A worker crashing must not abort the batch : the crashing file gets an Error record, the others their results """
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from helpers import *
+from coiffier_batch import solve_batch
+
+class CrashingCache:
+    """ Stands for a solution cache : kills the worker process on the LPs with 7 variables, caches nothing """
+
+    def fingerprint(self, lp):
+        if lp.nbVar==7:
+            os._exit(1)
+        return None
+
+    def get(self, fingerprint, backend, vertex):
+        return None
+
+    def get_basis(self, fingerprint):
+        return None
+
+    def put(self, fingerprint, result, backend, vertex):
+        pass
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_worker_crash(self):
+        files = []
+        for name in ("coiffier_partiel.in", "coiffier_test1.in", "coiffier_unbounded.in", "coiffier_lumberjack.in"):
+            files.append(os.path.join(self.directory.name, name))
+            shutil.copy(os.path.join(INPUTS, name), files[-1])
+        crash = os.path.join(self.directory.name, "crash.in")
+        with open(crash, 'w') as f:
+            f.write("7\n1\n1 1 1 1 1 1 1\n1\n1 1 1 1 1 1 1\n")
+        files.insert(1, crash)
+        output = io.StringIO()
+        solve_batch(files, output, workers=2, options={"rule": "Bland", "solutionCache": CrashingCache()})
+        records = {r["file"]: r for r in map(json.loads, output.getvalue().splitlines())}
+        self.assertEqual(sorted(records), sorted(files))
+        self.assertEqual(records[crash]["status"], "Error")
+        for f in files:
+            if f!=crash:
+                self.assertIn(records[f]["status"], ("Optimal", "Unbounded"), f)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+""" A failing instance must not stop the benchmark, and every record must say which engine and backend made it """
+
+import os
+import tempfile
+import unittest
+
+from helpers import *
+from coiffier_benchmark import input_instances, run_benchmark, summary, write_report, read_report
+
+class BenchmarkTest(SimplexTestCase):
+    options = ("engine", "backend", "rule")
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def test_error_record(self):
+        broken = os.path.join(self.directory.name, "broken.in")
+        with open(broken, 'w') as f:
+            f.write("2\n2\n1 1\n") # ends before b
+        instances = input_instances([broken, os.path.join(INPUTS, "coiffier_partiel.in")])
+        simplex.engine, simplex.backend = "Sparse", "Float"
+        records = run_benchmark(instances, ["Bland", "MaxCoeff"], [0], memory=False)
+        self.assertEqual(len(records), 4)
+        for r in records:
+            self.assertEqual((r["engine"], r["backend"]), ("Sparse", "Float"))
+            if r["instance"]=="broken.in":
+                self.assertEqual(r["status"], "Error")
+                self.assertIn("ValueError", r["error"])
+            else:
+                self.assertEqual(r["status"], "Optimal")
+                self.assertIsNone(r["error"])
+        self.assertIn("errors", summary(records))
+        report = os.path.join(self.directory.name, "report.csv")
+        write_report(records, report)
+        self.assertEqual([{k: r[k] for k in ("instance", "engine", "backend", "status", "error")} for r in read_report(report)],
+                         [{k: r[k] for k in ("instance", "engine", "backend", "status", "error")} for r in records])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+""" Every engine and backend must give the status and the objective of the exact Tableau on the files of inputs/ """
+
+import os
+import unittest
+from fractions import Fraction
+
+from helpers import *
+
+SLOW = {"coiffier_klee_minty_20.in", "coiffier_test_random2.in"} # too slow in exact arithmetic
+ENGINES = [("Tableau", "Float"), ("Revised", "Exact"), ("Revised", "Float"),
+           ("Sparse", "Exact"), ("Sparse", "Float"), ("Integer", "Exact")]
+
+class EnginesTest(SimplexTestCase):
+    options = ("engine", "backend", "rule")
+
+    def solve_file(self, path, engine, backend):
+        simplex.engine, simplex.backend = engine, backend
+        return simplex.simplex_solve(LinearProgram(path, sparse=(engine=="Sparse"), exact=(backend=="Exact")))
+
+    def test_inputs(self):
+        simplex.rule = "Bland"
+        for name in sorted(os.listdir(INPUTS)):
+            if not name.endswith(".in") or name in SLOW:
+                continue
+            path = os.path.join(INPUTS, name)
+            expected = self.solve_file(path, "Tableau", "Exact")
+            for engine,backend in ENGINES:
+                result = self.solve_file(path, engine, backend)
+                self.assertEqual(result.status, expected.status, (name, engine, backend))
+                if expected.is_optimal():
+                    if backend=="Exact":
+                        self.assertIsInstance(result.objective, Fraction)
+                        self.assertEqual(result.objective, expected.objective, (name, engine, backend))
+                    else:
+                        self.assertAlmostEqual(result.objective, float(expected.objective),
+                                               delta=1e-6*max(1, abs(expected.objective)), msg=(name, engine, backend))
+
+    def test_artificial_driven_out(self):
+        # phase 1 ends with an artificial variable basic at 0 : it is pivoted out before phase 2
+        text = "2\n3\n2 -2\n1 -2 2\n1 1\n1 -2\n2 2\n"
+        simplex.rule = "Bland"
+        for engine,backend in [("Tableau", "Exact")]+ENGINES:
+            simplex.engine, simplex.backend = engine, backend
+            result = self.solve_text(text, exact=(backend=="Exact"))
+            self.assertEqual(result.status, "Optimal", (engine, backend))
+            self.assertEqual(result.objective, -2, (engine, backend))
+
+if __name__ == '__main__':
+    unittest.main()
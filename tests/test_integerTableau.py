@@ -0,0 +1,41 @@
+""" The Integer engine must do the pivots of the Fraction tableau, and choose them without building any Fraction """
+
+import os
+import unittest
+
+from helpers import *
+
+FILES = ["coiffier_test_random3.in", "coiffier_partiel.in", "coiffier_lumberjack.in", "coiffier_unbounded.in"]
+
+class StrictIntegerTableau(IntegerTableau):
+    """ Fails as soon as a whole array of Fractions is built """
+    def fractions(self, values, denominator):
+        raise AssertionError("a whole array of Fractions was built")
+
+class IntegerTableauTest(SimplexTestCase):
+    options = ("engine", "rule", "ratioTest")
+
+    def solve_file(self, name, engine):
+        simplex.engine = engine
+        return simplex.simplex_solve(LinearProgram(os.path.join(INPUTS, name)))
+
+    def test_same_pivots(self):
+        for rule in ("Bland", "MaxCoeff", "Partial", "Custom"):
+            for test in ("Standard", "Lexicographic", "Bland"):
+                simplex.rule, simplex.ratioTest = rule, test
+                for name in FILES:
+                    expected, result = self.solve_file(name, "Tableau"), self.solve_file(name, "Integer")
+                    self.assertEqual((result.status, result.nbPivot), (expected.status, expected.nbPivot), (name, rule, test))
+                    self.assertEqual(result.objective, expected.objective, (name, rule, test))
+
+    def test_choice_without_fractions(self):
+        tab = StrictIntegerTableau(LinearProgram(os.path.join(INPUTS, "coiffier_test_random3.in")))
+        while True:
+            enteringVar = simplex.simplex_choose_entering(tab, "MaxCoeff")
+            if enteringVar==-1:
+                break
+            tab.do_pivot(enteringVar, simplex.simplex_choose_leaving(tab, enteringVar, "Lexicographic"))
+        self.assertTrue(tab.is_dual_feasible() and tab.is_primal_feasible())
+
+if __name__ == '__main__':
+    unittest.main()
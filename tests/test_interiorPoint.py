@@ -0,0 +1,51 @@
+""" The interior point engine must give the same status as the simplex, with or without crossover """
+
+import unittest
+import warnings
+import numpy as np
+
+from helpers import *
+
+class InteriorPointTest(SimplexTestCase):
+    options = ("engine", "crossover", "presolveMode", "rule")
+
+    def setUp(self):
+        super().setUp()
+        simplex.engine = "InteriorPoint"
+
+    def solve(self, text, crossover=True, presolve=False):
+        simplex.crossover, simplex.presolveMode = crossover, presolve
+        return self.solve_text(text)
+
+    def test_infeasible_with_improving_direction(self):
+        """ x_1 improves the objective without changing Ax, but the LP is infeasible """
+        for text in ("1\n3\n1\n5 5 -1\n0\n0\n0\n", "5\n2\n0 2 2 2 3\n-3 -3\n0 0 0 0 0\n0 0 0 0 0\n"):
+            for crossover in (True, False):
+                self.assertEqual(self.solve(text, crossover).status, "Infeasible")
+
+    def test_zero_objective_and_rhs(self):
+        for text in ("1\n1\n0\n2\n0\n", "2\n1\n1 1\n0\n1 1\n"):
+            result = self.solve(text, crossover=False)
+            self.assertEqual(result.status, "Optimal")
+            self.assertAlmostEqual(result.objective, 0)
+
+    def test_empty_after_presolve(self):
+        result = self.solve("1\n2\n-2\n1 2\n-2\n-2\n", presolve=True)
+        self.assertEqual(result.status, "Optimal")
+        self.assertEqual(result.objective, 0)
+
+    def test_diverging_iterates(self):
+        """ On infeasible and unbounded LPs the iterates diverge : no overflow warning, and the status of the simplex """
+        rng = np.random.default_rng(0)
+        simplex.rule = "Bland"
+        for k in range(900): # includes LPs whose iterates overflowed
+            n, m = rng.integers(1, 6), rng.integers(1, 6)
+            c, b, A = rng.integers(-5, 6, n), rng.integers(-5, 6, m), rng.integers(-5, 6, (m, n))
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", RuntimeWarning)
+                status = InteriorPoint(LinearProgram.from_arrays(c, b, A)).solve()
+            if status!="IterationLimit":
+                self.assertEqual(status, simplex.simplex_solve_tableau(LinearProgram.from_arrays(c, b, A)).status, k)
+
+if __name__ == '__main__':
+    unittest.main()
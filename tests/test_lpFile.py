@@ -0,0 +1,44 @@
+""" The text format must read LPs without constraints, and write floats without losing digits """
+
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from helpers import *
+from lib.lpFile import write_binary
+
+class LPFileTest(SimplexTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def test_no_constraints(self):
+        """ The constraint vector is an empty line """
+        result = self.solve_text("2\n0\n-1 -1\n\n")
+        self.assertEqual(result.status, "Optimal")
+        self.assertEqual(result.objective, 0)
+
+    def test_truncated_file(self):
+        with self.assertRaisesRegex(ValueError, "row 2 of the constraint matrix"):
+            self.solve_text("2\n2\n1 1\n1 1\n1 0\n")
+
+    def test_float_binary_to_text(self):
+        c = np.array([1e-13, 1/3])
+        b = np.array([4, 5.0000000000004])
+        A = np.array([[0.1, 2.0], [0.37000000000000005, 7.4]])
+        binary, text = os.path.join(self.directory.name, "lp.bin"), os.path.join(self.directory.name, "lp.in")
+        write_binary(binary, c, b, A)
+        LinearProgram(binary, exact=False).save(text, binary=False)
+        lp = LinearProgram(text, exact=False)
+        self.assertTrue(np.array_equal(lp.objectiveFunction, c))
+        self.assertTrue(np.array_equal(lp.constraintVector, b))
+        self.assertTrue(np.array_equal(lp.get_dense_matrix(), A))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+""" An LP that the presolve reduces to nothing is solved without the simplex, whatever the pivot rule """
+
+import unittest
+
+from helpers import *
+
+class FullyReducedTest(SimplexTestCase):
+    options = ("engine", "rule", "presolveMode")
+
+    def setUp(self):
+        super().setUp()
+        simplex.presolveMode = True
+
+    def solve(self, text, rule, engine="Tableau"):
+        simplex.rule, simplex.engine = rule, engine
+        return self.solve_text(text)
+
+    def test_every_variable_fixed(self):
+        """ x_1 >= 3 and x_2 >= 2 are substituted, then both columns are empty and fixed """
+        for rule,engine in (("MaxCoeff", "Tableau"), ("Custom", "Revised"), ("Partial", "Tableau"), ("Bland", "InteriorPoint")):
+            result = self.solve("2\n2\n-1 0\n-3 -2\n-1 0\n0 -1\n", rule, engine)
+            self.assertEqual(result.status, "Optimal")
+            self.assertEqual(list(result.solution), [3, 2])
+            self.assertEqual(result.objective, -3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+""" Partial and multiple pricing must reach the optimum of Bland's rule, and partial pricing must scan every window """
+
+import os
+import tempfile
+import unittest
+
+from helpers import *
+
+SLOW = {"coiffier_klee_minty_20.in", "coiffier_test_random2.in"} # too slow in exact arithmetic
+
+class PricingTest(SimplexTestCase):
+    options = ("rule", "pricingWindow", "candidateListSize")
+
+    def solve_file(self, path, rule):
+        simplex.rule = rule
+        return simplex.simplex_solve(LinearProgram(path))
+
+    def test_inputs(self):
+        simplex.pricingWindow, simplex.candidateListSize = 3, 2 # several windows and several candidate lists on small LPs
+        for name in sorted(os.listdir(INPUTS)):
+            if not name.endswith(".in") or name in SLOW:
+                continue
+            path = os.path.join(INPUTS, name)
+            expected = self.solve_file(path, "Bland")
+            for rule in ("Partial", "Multiple"):
+                result = self.solve_file(path, rule)
+                self.assertEqual(result.status, expected.status, (name, rule))
+                self.assertEqual(result.objective, expected.objective, (name, rule))
+
+    def test_partial_wraps_around(self):
+        # only x_1 improves : the windows starting at column 3 have to wrap around to reach it
+        with tempfile.NamedTemporaryFile('w', suffix=".in", delete=False) as f:
+            f.write("4\n1\n1 0 0 0\n1\n1 1 1 1\n")
+        try:
+            tab = Tableau(LinearProgram(f.name))
+        finally:
+            os.remove(f.name)
+        simplex.pricingWindow = 2
+        tab.pricingOffset = 2
+        self.assertEqual(simplex.simplex_choose_entering(tab, "Partial"), 1)
+        self.assertEqual(tab.pricingOffset, 1) # the next search starts after the window of x_1
+        tab.do_pivot(1, simplex.simplex_choose_leaving(tab, 1))
+        self.assertEqual(simplex.simplex_choose_entering(tab, "Partial"), -1) # every window was priced
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+""" The solution cache must not mix the results of different backends, nor interior and vertex solutions """
+
+import os
+import tempfile
+import unittest
+from fractions import Fraction
+import numpy as np
+
+from helpers import *
+
+PARTIEL = os.path.join(INPUTS, "coiffier_partiel.in")
+
+class SolutionCacheTest(SimplexTestCase):
+    options = ("solutionCache", "backend", "engine", "crossover", "rule", "presolveMode")
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        simplex.solutionCache = SolutionCache(self.directory.name)
+        simplex.rule = "Bland"
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def solve(self, backend, engine="Tableau", crossover=True, presolve=False):
+        simplex.backend, simplex.engine, simplex.crossover, simplex.presolveMode = backend, engine, crossover, presolve
+        return simplex.simplex_solve(LinearProgram(PARTIEL, exact=(backend=="Exact")))
+
+    def test_float_then_exact(self):
+        floatResult = self.solve("Float")
+        self.assertIsInstance(floatResult.objective, float)
+        exactResult = self.solve("Exact")
+        self.assertNotEqual(exactResult.settings["solution cache"], "hit, the LP was already solved") # the basis of the float run may warm start it
+        self.assertEqual(exactResult.objective, Fraction(135,7))
+        self.assertIsInstance(exactResult.objective, Fraction)
+        self.assertEqual(self.solve("Exact").settings["solution cache"], "hit, the LP was already solved")
+        self.assertIsInstance(self.solve("Float").objective, float)
+
+    def test_interior_solution_not_given_to_simplex(self):
+        interior = self.solve("Exact", "InteriorPoint", crossover=False)
+        self.assertIsInstance(interior.objective, float)
+        result = self.solve("Exact")
+        self.assertEqual(result.settings["solution cache"], "miss") # no basis was stored for a warm start either
+        self.assertEqual(result.objective, Fraction(135,7))
+
+    def test_presolve(self):
+        """ The postsolve drops the basis of the reduced LP : there is no basis to store """
+        self.assertEqual(self.solve("Exact", presolve=True).objective, Fraction(135,7))
+        result = self.solve("Exact", presolve=True)
+        self.assertEqual(result.settings["solution cache"], "hit, the LP was already solved")
+        self.assertEqual(result.objective, Fraction(135,7))
+
+class EvictionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_size_kept_up_to_date(self):
+        """ The directory is only scanned when the cache crosses its size, then goes down to lowWater*maxSize """
+        cache = SolutionCache(self.directory.name, maxSize=20000)
+        scans = []
+        scan = cache.scan
+        cache.scan = lambda: scans.append(1) or scan()
+        for k in range(200):
+            cache.store("entry{0}".format(k), list(range(50)))
+            cache.evict()
+            self.assertLessEqual(cache.size, cache.maxSize)
+            self.assertEqual(cache.size, sum(size for mtime,size,path in scan()))
+        self.assertLess(len(scans), 20)
+        self.assertLessEqual(SolutionCache(self.directory.name).size, 20000)
+
+    def test_touch_failure(self):
+        """ A result read from a cache whose access times can not be updated is still a hit """
+        cache = SolutionCache(self.directory.name)
+        cache.store("entry", [1, 2])
+        utime = os.utime
+        def failing_utime(*args):
+            raise PermissionError
+        os.utime = failing_utime
+        try:
+            self.assertEqual(cache.load("entry"), [1, 2])
+        finally:
+            os.utime = utime
+
+class FingerprintTest(unittest.TestCase):
+
+    def key(self, c, b):
+        A = np.array([[1,2],[3,1]], dtype=float)
+        return Fingerprint(LinearProgram.from_arrays(np.array(c, dtype=float), np.array(b, dtype=float), A)).key
+
+    def test_close_floats(self):
+        """ Floats equal up to 12 significant digits are different LPs """
+        self.assertNotEqual(self.key([1,1], [4,5]), self.key([1,1], [4,5.0000000000004]))
+        self.assertNotEqual(self.key([1e-13,1], [4,5]), self.key([1.00000000000001e-13,1], [4,5]))
+
+if __name__ == '__main__':
+    unittest.main()
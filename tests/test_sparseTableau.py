@@ -0,0 +1,51 @@
+""" The sparse tableau must keep its column index up to date, and beat the dense tableau on a sparse LP """
+
+import os
+import tempfile
+import unittest
+from time import perf_counter
+
+from helpers import *
+from LPgenerator import generate_block_diagonal
+
+class SparseTableauTest(SimplexTestCase):
+    options = ("engine", "backend", "rule")
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "blocks.in")
+        generate_block_diagonal(self.path, 60, 5, seed=1)
+        simplex.rule = "MaxCoeff"
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def test_column_index(self):
+        for text in ("2\n2\n1 1\n-1 -1\n1 0\n0 1\n", "3\n2\n1 2 -1\n4 -2\n1 1 1\n-1 2 0\n"):
+            with open(self.path, 'w') as f:
+                f.write(text)
+            lp = LinearProgram(self.path, sparse=True)
+            tab = SparseTableau(lp)
+            if lp.need_2_phases:
+                simplex.simplex_one_phase(tab, "phase1")
+                tab.transition_phaseI_phaseII(lp.objectiveFunction, False, False)
+            simplex.simplex_one_phase(tab)
+            self.assertEqual(len(tab.columns), tab.width-1)
+            for j,rows in enumerate(tab.columns):
+                self.assertEqual(rows, {i for i,row in enumerate(tab.rows) if j in row}, j)
+
+    def test_block_diagonal(self):
+        times, objectives = dict(), dict()
+        for engine in ("Tableau", "Sparse"):
+            simplex.engine = engine
+            lp = LinearProgram(self.path, sparse=(engine=="Sparse"))
+            clock = perf_counter()
+            objectives[engine] = simplex.simplex_solve(lp).objective
+            times[engine] = perf_counter()-clock
+        self.assertEqual(objectives["Sparse"], objectives["Tableau"])
+        self.assertLess(times["Sparse"], times["Tableau"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+""" The steepest edge rule must stay correct with floats, whose updated column norms drift """
+
+import os
+import tempfile
+import unittest
+
+from helpers import *
+from LPgenerator import generate_feasible
+
+class SteepestEdgeFloatTest(SimplexTestCase):
+    options = ("backend", "engine", "rule")
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        simplex.backend, simplex.rule = "Float", "Custom"
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def test_feasible_lps(self):
+        for seed in range(1, 11):
+            path = os.path.join(self.directory.name, "feasible{0}.in".format(seed))
+            optimum = generate_feasible(path, 80, 40, twophase=True, seed=seed)
+            for engine in ("Tableau", "Revised"):
+                simplex.engine = engine
+                result = simplex.simplex_solve(LinearProgram(path, exact=False))
+                self.assertEqual(result.status, "Optimal", (seed, engine))
+                self.assertAlmostEqual(result.objective, optimum, delta=1e-6*abs(optimum), msg=(seed, engine))
+
+if __name__ == '__main__':
+    unittest.main()